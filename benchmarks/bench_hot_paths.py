@@ -0,0 +1,200 @@
+"""热点路径基准测试
+
+用合成的各平台原始职位数据测量解析、薪资解析、过滤、职位要求检查和投递记录
+统计的耗时（微秒/条），结果可保存为基线，并在对比模式下发现性能回退。
+
+绝对耗时只在同一台机器上可比，基线不提交到仓库（benchmarks/.baseline.json
+已加入 .gitignore）：先在改动前的代码上保存基线，再在同一台机器上对比。
+基线记录了主机信息，在其他主机上对比时直接报错。
+
+用法（在仓库根目录运行）:
+    python -m benchmarks.bench_hot_paths --size 10000
+    git stash   # 或切换到改动前的提交
+    python -m benchmarks.bench_hot_paths --size 10000 --save-baseline
+    git stash pop
+    python -m benchmarks.bench_hot_paths --size 10000 --compare --threshold 0.2
+"""
+import gc
+import os
+import platform
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+from typing import Callable, Dict, List
+from benchmarks.mock_board import make_job, boss_item, liepin_item, zhilian_item
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), '.baseline.json')
+KEYWORDS = ['python', 'golang', '数据开发', '后端']
+CITIES = ['101010100', '101020100', '101280600']
+
+def generate_payloads(size: int) -> Dict[str, List[Dict]]:
+    """按各平台原始格式生成 size 条职位"""
+    jobs = [
+        make_job('bench', KEYWORDS[i % len(KEYWORDS)], CITIES[i % len(CITIES)], i)
+        for i in range(size)
+    ]
+    return {
+        'boss': [boss_item(job, with_desc=True) for job in jobs],
+        'liepin': [liepin_item(job) for job in jobs],
+        'zhilian': [zhilian_item(job) for job in jobs]
+    }
+
+def make_config(data_dir: str) -> Dict:
+    """基于 config/config.json，把所有存储路径指向临时目录"""
+    with open('config/config.json', 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    config['storage'] = {'db_path': os.path.join(data_dir, 'jobbot.db')}
+    config['journal'] = {'dir': os.path.join(data_dir, 'journal'), 'fsync_every': 1000}
+    config['cache'] = {
+        'path': os.path.join(data_dir, 'responses.db'),
+        'recruiters': {'path': os.path.join(data_dir, 'recruiters.db')},
+        'details': {'path': os.path.join(data_dir, 'details.db')},
+        'ai': {'path': os.path.join(data_dir, 'ai.db')}
+    }
+    config['ai']['embedding']['path'] = os.path.join(data_dir, 'vectors')
+    config['ai']['api']['provider'] = 'custom'
+    config['job_preferences'].update(
+        keywords=KEYWORDS, cities=CITIES, expected_salary=[15, 40],
+        education='本科', max_work_year=5
+    )
+    config['platforms'].setdefault('liepin', {})
+    config['platforms'].setdefault('zhilian', {})
+    return config
+
+def timeit(func: Callable[[], object], count: int, repeat: int, warmup: bool = True) -> float:
+    """预热一次后运行 repeat 次取最快一次，返回每条耗时（微秒）"""
+    if warmup:
+        func()
+    best = float('inf')
+    # 与 timeit 模块一致，计时期间关闭GC以减少抖动
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best / max(1, count) * 1e6
+
+def run_benchmarks(size: int, repeat: int) -> Dict[str, float]:
+    from platforms.boss import BossBot
+    from platforms.liepin import LiepinBot
+    from platforms.zhilian import ZhilianBot
+    from utils.salary import parse_salary
+    from utils.analyzer import JobAnalyzer
+    from utils.job_store import JobStore
+    from utils.journal import DeliveryJournal
+
+    payloads = generate_payloads(size)
+    data_dir = tempfile.mkdtemp(prefix='jobbot-bench-')
+    try:
+        config = make_config(data_dir)
+        bots = {'boss': BossBot(config), 'liepin': LiepinBot(config), 'zhilian': ZhilianBot(config)}
+        results = {}
+
+        for name, bot in bots.items():
+            results[f'{name}._parse_jobs'] = timeit(lambda: bot._parse_jobs(payloads[name]), size, repeat)
+
+        boss = bots['boss']
+        jobs = boss._parse_jobs(payloads['boss'])
+        salaries = [item['salaryDesc'] for item in payloads['boss']]
+
+        def parse_cold():
+            parse_salary.cache_clear()
+            for text in salaries:
+                parse_salary(text)
+        results['parse_salary'] = timeit(parse_cold, size, repeat)
+        results['_should_skip_job'] = timeit(lambda: [boss._should_skip_job(job) for job in jobs], len(jobs), repeat)
+        results['_check_job_requirements'] = timeit(
+            lambda: [boss._check_job_requirements(job) for job in jobs], len(jobs), repeat
+        )
+
+        # 投递记录每轮使用新的库和日志目录，避免重复插入被忽略而变快
+        add_times, save_times = [], []
+        for i in range(repeat):
+            run_dir = os.path.join(data_dir, f'records-{i}')
+            analyzer = JobAnalyzer(
+                'boss',
+                JobStore(os.path.join(run_dir, 'jobbot.db')),
+                DeliveryJournal(os.path.join(run_dir, 'journal'), fsync_every=1000)
+            )
+            add_times.append(timeit(lambda: [analyzer.add_job(job) for job in jobs], len(jobs), 1, warmup=False))
+            save_times.append(timeit(analyzer.save_records, len(jobs), 1, warmup=False))
+            analyzer.store.close()
+        results['JobAnalyzer.add_job'] = min(add_times)
+        results['JobAnalyzer.save_records'] = min(save_times)
+        results['JobAnalyzer.get_statistics'] = timeit(analyzer.get_statistics, len(jobs), repeat)
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float,
+            min_delta: float = 0.5) -> List[str]:
+    """返回超过阈值的回退项；绝对差值小于 min_delta 微秒的视为测量噪声"""
+    regressions = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base and value > base * (1 + threshold) and value - base >= min_delta:
+            regressions.append(f"{name}: {base:.2f} -> {value:.2f} us/条 (+{value / base - 1:.0%})")
+    return regressions
+
+def host_info() -> Dict[str, str]:
+    """基线所在主机，不同主机的结果不可比"""
+    return {
+        'node': platform.node(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python': platform.python_version()
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='热点路径基准测试')
+    parser.add_argument('--size', type=int, default=10000, help='合成职位数量（建议 1万 ~ 100万）')
+    parser.add_argument('--repeat', type=int, default=3, help='每项重复次数，取最快一次')
+    parser.add_argument('--save-baseline', action='store_true', help='把结果保存为本机基线')
+    parser.add_argument('--compare', action='store_true', help='与本机基线对比，出现回退时返回非零')
+    parser.add_argument('--threshold', type=float, default=0.2, help='允许的回退比例')
+    parser.add_argument('--min-delta', type=float, default=0.5, help='忽略小于该值的差异（微秒/条）')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    results = run_benchmarks(args.size, args.repeat)
+    for name, value in results.items():
+        print(f"{name:<32} {value:>10.2f} us/条")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'size': args.size, 'host': host_info(), 'results': results}, f, indent=2)
+        print(f"基线已保存到: {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"没有基线: {args.baseline}，请先在本机改动前的代码上运行 --save-baseline")
+            sys.exit(2)
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('host') != host_info():
+            print(f"基线来自其他主机（{baseline.get('host')}），结果不可比，请在本机重新运行 --save-baseline")
+            sys.exit(2)
+        if baseline.get('size') != args.size:
+            print(f"注意: 基线的职位数量为 {baseline.get('size')}，本次为 {args.size}")
+        regressions = compare(results, baseline['results'], args.threshold, args.min_delta)
+        if regressions:
+            print("性能回退:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"未发现超过 {args.threshold:.0%} 的性能回退")
+
+if __name__ == '__main__':
+    main()
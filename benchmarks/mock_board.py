@@ -0,0 +1,285 @@
+"""本地模拟招聘网站
+
+实现 BossBot、LiepinBot、ZhilianBot 调用的搜索、登录检查、职位详情、HR信息
+和投递接口，用于离线压测和回归测试。把 platforms.<name>.base_url 指向本服务
+（如 http://127.0.0.1:8765）即可让平台请求全部落到本地。
+
+用法:
+    python -m benchmarks.mock_board --port 8765 --jobs-per-query 300 \\
+        --latency-ms 50 --throttle-rate 0.01 --error-rate 0.01
+"""
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import logging
+from collections import Counter
+from typing import Dict, List, Optional
+from aiohttp import web
+
+COMPANIES = ['字节跳动', '腾讯', '阿里巴巴', '美团', '某外包公司', '京东', '网易', '快手', '小红书', '拼多多']
+JOB_NAMES = ['Python开发工程师', '后端开发', '数据开发工程师', 'Java开发（外包）', '全栈工程师', '算法工程师']
+SALARIES = ['15-25K', '20-35K·14薪', '300-500元/天', '25-40万/年', '面议', '18-30K·13薪', '1-1.5万']
+SIZES = ['少于15人', '20-99人', '100-499人', '1000-9999人', '10000人以上']
+EXPERIENCES = ['1-3年', '3-5年', '5-10年', '经验不限', '应届生']
+EDUCATIONS = ['大专', '本科', '硕士']
+ACTIVITY = ['刚刚活跃', '今日活跃', '本周活跃', '半年前活跃']
+THROTTLE_MESSAGE = '您的操作过于频繁，请稍后再试'
+
+def make_job(platform: str, keyword: str, city: str, index: int) -> Dict:
+    """按序号确定性生成一个职位（与平台无关的字段）"""
+    digest = hashlib.md5(f"{platform}|{keyword}|{city}|{index}".encode('utf-8')).hexdigest()
+    n = int(digest[:8], 16)
+    return {
+        'id': digest[:16],
+        'boss_id': f"boss{n % 997}",
+        'name': f"{JOB_NAMES[n % len(JOB_NAMES)]}-{keyword}",
+        'company': COMPANIES[(n >> 3) % len(COMPANIES)],
+        'salary': SALARIES[(n >> 6) % len(SALARIES)],
+        'size': SIZES[(n >> 9) % len(SIZES)],
+        'experience': EXPERIENCES[(n >> 12) % len(EXPERIENCES)],
+        'education': EDUCATIONS[(n >> 15) % len(EDUCATIONS)],
+        'city': city,
+        'desc': f"负责{keyword}相关系统的设计与开发，熟悉Python、MySQL、Redis。" * (1 + n % 5),
+        'update_time': int(time.time() * 1000) - (n % 72) * 3600 * 1000
+    }
+
+def boss_item(job: Dict, with_desc: bool = False) -> Dict:
+    """BOSS直聘 joblist.json 中的职位格式"""
+    item = {
+        'encryptJobId': job['id'],
+        'encryptBossId': job['boss_id'],
+        'jobName': job['name'],
+        'brandName': job['company'],
+        'salaryDesc': job['salary'],
+        'cityName': job['city'],
+        'bossName': f"HR{job['boss_id']}",
+        'companySize': job['size'],
+        'jobExperience': job['experience'],
+        'jobDegree': job['education'],
+        'jobLabels': ['Python', 'MySQL'],
+        'updateTime': job['update_time'],
+        'lid': f"lid-{job['id']}"
+    }
+    if with_desc:
+        item['jobDesc'] = job['desc']
+    return item
+
+def liepin_item(job: Dict) -> Dict:
+    """猎聘 jobCardList 中的职位格式"""
+    return {
+        'jobId': job['id'],
+        'jobName': job['name'],
+        'companyName': job['company'],
+        'salary': job['salary'],
+        'cityName': job['city'],
+        'recruiterName': f"HR{job['boss_id']}",
+        'companySize': job['size'],
+        'requireWorkYears': job['experience'],
+        'requireEduLevel': job['education'],
+        'labels': ['Python'],
+        'advertiseFlag': False
+    }
+
+def zhilian_item(job: Dict) -> Dict:
+    """智联招聘 sou 接口 results 中的职位格式"""
+    return {
+        'number': job['id'],
+        'jobName': job['name'],
+        'company': {'name': job['company'], 'size': {'name': job['size']}},
+        'salary': job['salary'],
+        'city': {'display': job['city']},
+        'recruiterName': f"HR{job['boss_id']}",
+        'workingExp': {'name': job['experience']},
+        'eduLevel': {'name': job['education']},
+        'welfare': [{'name': '五险一金'}]
+    }
+
+class MockBoard:
+    """模拟招聘网站
+
+    每个 (keyword, city) 固定产生 jobs_per_query 个职位，内容由职位序号确定性
+    生成，多次搜索结果一致。每个请求先等待 latency_ms（±50%抖动），再按
+    throttle_rate 返回限流提示、按 error_rate 返回 HTTP 500。
+    """
+
+    def __init__(self, jobs_per_query: int = 300, latency_ms: float = 0,
+                 throttle_rate: float = 0, error_rate: float = 0,
+                 desc_in_list: bool = False, seed: Optional[int] = None):
+        self.jobs_per_query = jobs_per_query
+        self.latency = latency_ms / 1000
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.desc_in_list = desc_in_list
+        self.random = random.Random(seed)
+        self.requests = Counter()
+        self.delivered: Dict[str, set] = {'boss': set(), 'liepin': set(), 'zhilian': set()}
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._runner: Optional[web.AppRunner] = None
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get('/', self.boss_home)
+        app.router.add_get('/wapi/zpgeek/common/data/getGeekInfo', self.boss_geek_info)
+        app.router.add_get('/wapi/zpgeek/search/joblist.json', self.boss_search)
+        app.router.add_get('/wapi/zpgeek/job/detail.json', self.boss_detail)
+        app.router.add_get('/wapi/zpgeek/boss/info/get.json', self.boss_hr_info)
+        app.router.add_post('/wapi/zpgeek/job/start.json', self.boss_deliver)
+        app.router.add_get('/api/com.liepin.usercenter.user.getUserInfo', self.liepin_user)
+        app.router.add_post('/api/com.liepin.searchfront.search-for-pc', self.liepin_search)
+        app.router.add_post('/api/com.liepin.delivery.client.delivery.submitDelivery', self.liepin_deliver)
+        app.router.add_get('/api/user/getUserInfo', self.zhilian_user)
+        app.router.add_get('/c/i/sou', self.zhilian_search)
+        app.router.add_post('/c/i/resume/deliver', self.zhilian_deliver)
+        app.router.add_get('/_stats', self.stats_handler)
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """在当前事件循环中启动服务，返回 base_url（port为0时自动分配端口）"""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self) -> Dict:
+        return {
+            "requests": dict(self.requests),
+            "delivered": {platform: len(ids) for platform, ids in self.delivered.items()}
+        }
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests[request.path] += 1
+        if request.path == '/_stats':
+            return await handler(request)
+        if self.latency:
+            await asyncio.sleep(self.latency * self.random.uniform(0.5, 1.5))
+        if self.error_rate and self.random.random() < self.error_rate:
+            return web.Response(status=500, text='Internal Server Error')
+        if self.throttle_rate and self.random.random() < self.throttle_rate:
+            # 业务层限流：HTTP 200，code 为非成功值，message 含"频繁"
+            code = 429 if request.path.startswith(('/c/i', '/api/user')) else 9
+            return web.json_response({'code': code, 'message': THROTTLE_MESSAGE})
+        return await handler(request)
+
+    def _page(self, platform: str, keyword: str, city: str, page: int, page_size: int) -> List[Dict]:
+        start = (max(1, page) - 1) * page_size
+        end = min(start + page_size, self.jobs_per_query)
+        return [make_job(platform, keyword, city, i) for i in range(start, end)]
+
+    # ---- BOSS直聘 ----
+
+    async def boss_home(self, request: web.Request):
+        response = web.Response(text='<html>mock zhipin</html>', content_type='text/html')
+        response.set_cookie('__zp_stoken__', 'mock')
+        return response
+
+    async def boss_geek_info(self, request: web.Request):
+        return web.json_response({'code': 0, 'zpData': {'name': 'mock'}})
+
+    async def boss_search(self, request: web.Request):
+        query = request.query
+        jobs = self._page('boss', query.get('query', ''), query.get('city', ''),
+                          int(query.get('page', 1)), int(query.get('pageSize', 30)))
+        job_list = [boss_item(job, self.desc_in_list) for job in jobs]
+        return web.json_response({'code': 0, 'zpData': {'jobList': job_list, 'hasMore': bool(job_list)}})
+
+    async def boss_detail(self, request: web.Request):
+        job_id = request.query.get('encryptJobId', '')
+        return web.json_response({
+            'code': 0,
+            'zpData': {
+                'jobInfo': {
+                    'encryptId': job_id,
+                    'postDescription': f"职位 {job_id}：负责后端系统的设计与开发，熟悉Python、MySQL、Redis。",
+                    'address': '上海市浦东新区'
+                },
+                'brandComInfo': {'industryName': '互联网'}
+            }
+        })
+
+    async def boss_hr_info(self, request: web.Request):
+        boss_id = request.query.get('encryptBossId', '')
+        activity = ACTIVITY[int(hashlib.md5(boss_id.encode('utf-8')).hexdigest()[:4], 16) % len(ACTIVITY)]
+        return web.json_response({'code': 0, 'zpData': {'activeTimeDesc': activity}})
+
+    async def boss_deliver(self, request: web.Request):
+        data = await request.json()
+        job_id = data.get('jobId')
+        if job_id in self.delivered['boss']:
+            return web.json_response({'code': 1, 'message': '已经沟通过'})
+        self.delivered['boss'].add(job_id)
+        return web.json_response({'code': 0, 'zpData': {}})
+
+    # ---- 猎聘 ----
+
+    async def liepin_user(self, request: web.Request):
+        return web.json_response({'code': 0, 'data': {'name': 'mock'}})
+
+    async def liepin_search(self, request: web.Request):
+        form = (await request.json())['data']['mainSearchPcConditionForm']
+        jobs = self._page('liepin', form.get('key', ''), form.get('city', ''),
+                          int(form.get('currentPage', 1)), int(form.get('pageSize', 40)))
+        cards = [liepin_item(job) for job in jobs]
+        return web.json_response({'code': 0, 'data': {'data': {'jobCardList': cards}}})
+
+    async def liepin_deliver(self, request: web.Request):
+        data = await request.json()
+        self.delivered['liepin'].add(data['data']['jobId'])
+        return web.json_response({'code': 0, 'data': {}})
+
+    # ---- 智联招聘 ----
+
+    async def zhilian_user(self, request: web.Request):
+        return web.json_response({'code': 200, 'data': {'name': 'mock'}})
+
+    async def zhilian_search(self, request: web.Request):
+        query = request.query
+        jobs = self._page('zhilian', query.get('kw', ''), query.get('cityId', ''),
+                          int(query.get('page', 1)), int(query.get('pageSize', 30)))
+        results = [zhilian_item(job) for job in jobs]
+        return web.json_response({'code': 200, 'data': {'results': results}})
+
+    async def zhilian_deliver(self, request: web.Request):
+        data = await request.json()
+        self.delivered['zhilian'].add(data['jobNumber'])
+        return web.json_response({'code': 200, 'data': {}})
+
+    async def stats_handler(self, request: web.Request):
+        return web.json_response(self.stats())
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='本地模拟招聘网站')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--jobs-per-query', type=int, default=300, help='每个关键词×城市的职位总数')
+    parser.add_argument('--latency-ms', type=float, default=0, help='每个请求的平均延迟')
+    parser.add_argument('--throttle-rate', type=float, default=0, help='返回限流提示的概率')
+    parser.add_argument('--error-rate', type=float, default=0, help='返回HTTP 500的概率')
+    parser.add_argument('--desc-in-list', action='store_true', help='BOSS列表接口直接返回职位描述')
+    parser.add_argument('--seed', type=int, default=None)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    board = MockBoard(
+        jobs_per_query=args.jobs_per_query,
+        latency_ms=args.latency_ms,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        desc_in_list=args.desc_in_list,
+        seed=args.seed
+    )
+    print(f"模拟招聘网站运行在 http://{args.host}:{args.port}")
+    web.run_app(board.make_app(), host=args.host, port=args.port, print=None)
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,8 @@ from platforms.boss import BossBot
 from utils.logger import setup_logger
 from utils.resume_analyzer import ResumeAnalyzer
 from utils.login import BossLogin
+from utils.http_client import close_http_client
+from utils.supervisor import AccountSupervisor
 
 # 默认配置
 default_config = {
@@ -53,6 +55,7 @@ def parse_args():
     parser.add_argument('--config', default='config/config.json', help='配置文件路径')
     parser.add_argument('--debug', action='store_true', help='启用调试模式')
     parser.add_argument('--no-proxy', action='store_true', help='禁用代理')
+    parser.add_argument('--supervisor', action='store_true', help='按 supervisor.accounts 多账号并行运行')
     return parser.parse_args()
 
 async def init_from_resume():
@@ -65,7 +68,7 @@ async def init_from_resume():
         
     # 2. 初始化BOSS直聘平台
     platform = BossBot(default_config)
-    if not platform.login():
+    if not await platform.login():
         print("登录失败,请检查Cookie是否有效")
         return None
         
@@ -130,7 +133,7 @@ async def check_login():
     cookies_file = 'cookies/boss_cookies.txt'
     
     # 如果Cookie文件不存在或已过期，则自动登录
-    if not os.path.exists(cookies_file) or is_cookie_expired(cookies_file):
+    if not os.path.exists(cookies_file) or await is_cookie_expired(cookies_file):
         login_handler = BossLogin()
         cookies = await login_handler.login()
         if not cookies:
@@ -138,17 +141,17 @@ async def check_login():
             return False
     return True
 
-def is_cookie_expired(cookies_file: str) -> bool:
+async def is_cookie_expired(cookies_file: str) -> bool:
     """检查Cookie是否过期"""
     try:
         platform = BossBot(default_config)
-        return not platform.login()
+        return not await platform.login()
     except:
         return True
 
-def main():
+async def run():
     # 检查登录状态
-    if not asyncio.run(check_login()):
+    if not await check_login():
         return
         
     print("请选择初始化模式：")
@@ -160,9 +163,9 @@ def main():
     config = None
     
     if choice == "1":
-        config = asyncio.run(init_from_resume())
+        config = await init_from_resume()
     elif choice == "2":
-        config = asyncio.run(init_from_manual_input())
+        config = await init_from_manual_input()
     else:
         config = load_config()
     
@@ -185,8 +188,8 @@ def main():
     
     # 执行任务
     try:
-        if platform.login():
-            platform.search_jobs()
+        if await platform.login():
+            await platform.search_jobs()
             # 输出统计信息
             stats = platform.analyzer.get_statistics()
             logger.info(f"\n投递统计:\n{json.dumps(stats, ensure_ascii=False, indent=2)}")
@@ -195,5 +198,29 @@ def main():
     except Exception as e:
         logger.error(f"执行失败: {str(e)}")
 
+async def main_async():
+    try:
+        await run()
+    finally:
+        await close_http_client()
+
+def run_supervisor(args):
+    """多账号模式：每个账号一个进程"""
+    config = load_config(args.config)
+    if args.no_proxy:
+        config['global']['use_proxy'] = False
+    if not check_environment():
+        return
+    logger = setup_logger(config['global']['log_level'])
+    results = AccountSupervisor(config).run()
+    logger.info(f"\n投递统计:\n{json.dumps(results, ensure_ascii=False, indent=2)}")
+
+def main():
+    args = parse_args()
+    if args.supervisor:
+        run_supervisor(args)
+        return
+    asyncio.run(main_async())
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,71 +1,438 @@
 from abc import ABC, abstractmethod
-import json
-import time
-import random
-import requests
+import asyncio
 import logging
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Optional
+from utils.http_client import get_http_client
+from utils.job_store import get_job_store
+from utils.response_cache import cancel_inflight_fetches, get_response_cache
+from utils.job import Job
+from utils.analyzer import JobAnalyzer
+from utils.notifier import JobNotifier
+from utils.pipeline import BatchStage, Pipeline, Stage
+from utils.search_engine import SearchEngine, PageStats
+from utils.blacklist import BlacklistMatcher
+from utils.salary import parse_salary
+from utils.rate_limiter import get_rate_limiter
+from utils.quota import get_delivery_quota
+from utils.journal import get_delivery_journal
+from utils.prescorer import get_prescorer
 
 class BasePlatform(ABC):
+    platform_name = ''
+    success_code = 0  # 平台接口表示成功的 code
+    base_urls: Dict[str, str] = {}  # 接口地址，如 {'default': 'https://...', 'user': 'https://...'}
+    
     def __init__(self, config):
         self.config = config
-        self.session = requests.Session()
-        self.blacklist = self._load_blacklist()
+        self.http = get_http_client(config)
+        self.cookies = {}
+        # 多账号运行时由 supervisor 注入账号信息
+        self.account = config.get('account', {}).get('name', '')
+        self.proxy = config['platforms'].get(self.platform_name, {}).get('proxy')
+        self.claim_ttl = config.get('supervisor', {}).get('claim_ttl_minutes', 60) * 60
+        self.store = get_job_store(config)
+        self.response_cache = get_response_cache(config)
+        self.detail_cache = get_response_cache(config, 'details')
+        self.rate_limiter = get_rate_limiter(config)
+        # 投递日志须在配额之前创建：创建时会把残留日志合并进 JobStore，配额据此初始化
+        self.journal = get_delivery_journal(config)
+        self.quota = get_delivery_quota(self.platform_name, config)
+        self.blacklist = BlacklistMatcher('blacklist.json')
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.analyzer = JobAnalyzer(self.platform_name, self.store, self.journal, self.account)
+        self.analyzer.add_stats_source('response_cache', self.response_cache.stats)
+        self.analyzer.add_stats_source('detail_cache', self.detail_cache.stats)
+        self.analyzer.add_stats_source('rate_limiter', self.rate_limiter.stats)
+        self.analyzer.add_stats_source('quota', self.quota.stats)
+        self.notifier = JobNotifier(config)
+        self.ai_service = None  # 需要AI评分/打招呼语的平台自行创建
+        self.prescorer = get_prescorer(config)
+        self._prescore_stats = {"scored": 0, "rejected": 0, "uncertain": 0}
+        self.analyzer.add_stats_source('prescore', lambda: dict(self._prescore_stats))
+        self.pipeline: Optional[Pipeline] = None
+        self._engine: Optional[SearchEngine] = None
         
-    def _load_blacklist(self):
-        try:
-            with open('blacklist.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {
-                "blackCompanies": [],
-                "blackRecruiters": ["猎头"],
-                "blackJobs": ["外包", "外派"]
-            }
-            
     @abstractmethod
-    def login(self) -> bool:
+    async def login(self) -> bool:
         """平台登录"""
         pass
     
     @abstractmethod
-    def search_jobs(self):
-        """搜索职位"""
+    async def _fetch_jobs(self, keyword: str, city: str, page: int,
+                          stats: Optional[PageStats] = None) -> List[Job]:
+        """获取并解析一页职位；请求失败时抛出异常，返回空列表表示该页确实没有职位"""
         pass
+        
+    @abstractmethod
+    async def _deliver_job(self, job: Job) -> bool:
+        """向平台提交投递"""
+        pass
+        
+    async def _fetch_job_detail(self, job: Job) -> Optional[Dict]:
+        """获取职位详情，返回要补充到职位上的字段（如 job_desc）；平台按需实现，
+        失败时返回None（不缓存）
+        """
+        return None
+        
+    def _check_job_basic(self, job: Job) -> bool:
+        """只用列表字段的质量检查（如公司规模、更新时间），在请求详情之前执行；平台按需覆盖"""
+        return True
+        
+    async def _check_job_quality(self, job: Job) -> bool:
+        """需要额外请求的质量检查，平台按需覆盖"""
+        return True
+        
+    async def _wait_delivery_quota(self) -> bool:
+        """等待投递配额：每小时配额用完时等到窗口空出名额，每日配额用完返回False"""
+        while not self.quota.daily_exhausted():
+            wait = self.quota.hourly_wait()
+            if wait <= 0:
+                return True
+            self.logger.info(f"已达到每小时投递限制: {self.quota.hourly_limit}，等待 {wait:.0f} 秒")
+            await asyncio.sleep(wait)
+        return False
+        
+    async def iter_jobs(self) -> AsyncIterator[Job]:
+        """流式产出搜索到的职位（关键词×城市并发搜索）"""
+        engine = self._engine = SearchEngine(self, self.config)
+        try:
+            async for job in engine.iter_jobs():
+                yield job
+        finally:
+            await engine.stop()
+            
+    async def search_jobs(self):
+        """搜索并投递职位：iter_jobs 产出的职位依次流经各阶段"""
+        self._max_jobs = self.config['platforms'][self.platform_name].get('max_jobs', 100)
+        self._delivered = 0
+        self._run_job_ids = set()
+        
+        self.pipeline = self._build_pipeline()
+        try:
+            await self.pipeline.run(self.iter_jobs())
+        finally:
+            # 流水线停止后，本实例发起的详情/HR/AI请求可能仍在进行
+            await cancel_inflight_fetches(self, self.ai_service)
+        
+        # 保存投递记录和预评分语料
+        self.analyzer.save_records()
+        if self.prescorer is not None:
+            self.prescorer.save()
+        self.logger.info(f"流水线统计: {self.pipeline.stats()}")
+        self.logger.info(f"总计投递: {self._delivered} 个职位")
+        
+    def _build_pipeline(self) -> Pipeline:
+        """去重 → 过滤 → 质量检查 → 职位详情 → 本地预评分 → AI评分 → 打招呼语 → 投递 → 记录
+        列表级的低成本过滤和按招聘者缓存的质量检查在前，只有通过的职位才请求详情；
+        各阶段并发数和缓冲区可在配置中调整
+        """
+        pipeline_config = self.config.get('pipeline', {})
+        
+        def stage(name, func, concurrency, buffer_size):
+            stage_config = pipeline_config.get(name, {})
+            return Stage(
+                name,
+                func,
+                stage_config.get('concurrency', concurrency),
+                stage_config.get('buffer', buffer_size)
+            )
+            
+        return Pipeline([
+            stage('dedup', self._stage_dedup, 1, 100),
+            stage('filter', self._stage_filter, 1, 100),
+            stage('quality', self._stage_quality, 4, 20),
+            stage('detail', self._stage_detail, 4, 20),
+            self._prescore_stage(pipeline_config.get('prescore', {})),
+            self._score_stage(pipeline_config.get('score', {})),
+            stage('greeting', self._stage_greeting, 2, 10),
+            stage('deliver', self._stage_deliver, 1, 5),
+            stage('record', self._stage_record, 1, 10),
+        ], on_done=self._on_job_done)
+        
+    def _on_job_done(self, job: Job):
+        """职位已投递或被丢弃，通知搜索引擎（归还预取名额）"""
+        if self._engine is not None:
+            self._engine.job_done(job)
+        
+    async def _stage_dedup(self, job: Job) -> Optional[Job]:
+        """跳过已投递以及本轮已经处理过的职位（同一职位可能出现在多个关键词/城市下）；
+        多账号运行时还需认领成功，避免多个账号处理同一职位
+        """
+        if job.job_id in self._run_job_ids or self.store.is_applied(self.platform_name, job.job_id):
+            return None
+        self._run_job_ids.add(job.job_id)
+        if self.account and not self.store.claim(self.platform_name, job.job_id, self.account, self.claim_ttl):
+            return None
+        return job
+        
+    async def _stage_filter(self, job: Job) -> Optional[Job]:
+        """黑名单、薪资及列表级质量检查等低成本过滤"""
+        if self._should_skip_job(job):
+            self.logger.debug(f"跳过职位: {job.job_name} - {job.company_name}")
+            return None
+        if not self._check_job_basic(job):
+            self.logger.debug(f"职位质量不达标: {job.job_name} - {job.company_name}")
+            return None
+        return job
+        
+    async def _stage_quality(self, job: Job) -> Optional[Job]:
+        """需要额外请求的质量检查（如HR活跃度，结果按招聘者缓存），在请求职位详情之前执行"""
+        if not await self._check_job_quality(job):
+            self.logger.debug(f"职位质量不达标: {job.job_name} - {job.company_name}")
+            return None
+        return job
+        
+    async def _stage_detail(self, job: Job) -> Optional[Job]:
+        """列表中没有职位描述时按需获取详情（带缓存），并对描述再做一次关键词过滤"""
+        if job.has_desc:
+            return job
+        key = self.detail_cache.make_key(self.platform_name, 'detail', job.job_id)
+        detail = await self.detail_cache.get_or_fetch(key, lambda: self._fetch_job_detail(job), self)
+        if not detail:
+            return job
+        for field, value in detail.items():
+            if value and not getattr(job, field):
+                setattr(job, field, value)
+        if self.blacklist.match_keywords(job.job_desc):
+            self.logger.debug(f"职位描述命中黑名单关键词: {job.job_name} - {job.company_name}")
+            return None
+        return job
+        
+    def _use_ai_score(self) -> bool:
+        return self.ai_service is not None and self.config.get('enable_ai', True)
+        
+    def _prescore_stage(self, stage_config: Dict) -> BatchStage:
+        """预评分只用于减少AI评分请求，不使用AI评分时职位直接通过"""
+        use_embedding = self.config['ai'].get('embedding', {}).get('enabled', False)
+        active = (self.prescorer is not None or use_embedding) and self._use_ai_score()
+        return BatchStage(
+            'prescore',
+            self._stage_prescore,
+            1,
+            stage_config.get('buffer', 50),
+            batch_size=stage_config.get('batch_size', 32) if active else 1,
+            max_wait=stage_config.get('max_wait_ms', 500) / 1000
+        )
+        
+    async def _stage_prescore(self, jobs: List[Job]) -> List[Job]:
+        """本地预评分：达到 prescore.threshold 的职位交给AI评分；低于阈值但在 band 以内的
+        职位视为不确定，同样交给AI；其余直接丢弃。启用 ai.embedding 时改用简历与职位的向量相似度
+        """
+        if not self._use_ai_score():
+            return jobs
+        embedding_config = self.config['ai'].get('embedding', {})
+        if embedding_config.get('enabled', False):
+            # 向量相似度：职位向量按内容缓存，每个职位只请求一次
+            try:
+                scores = await self.ai_service.job_similarity(jobs)
+            except Exception as e:
+                self.logger.error(f"向量预评分失败: {str(e)}")
+                return jobs
+            threshold = embedding_config.get('threshold', 50)
+            band = embedding_config.get('band', 10)
+        elif self.prescorer is not None:
+            prescore_config = self.config.get('prescore', {})
+            scores = self.prescorer.score(jobs)
+            threshold = prescore_config.get('threshold', 20)
+            band = prescore_config.get('band', 10)
+        else:
+            return jobs
+        passed = []
+        for job, score in zip(jobs, scores):
+            self._prescore_stats['scored'] += 1
+            if score < threshold - band:
+                self._prescore_stats['rejected'] += 1
+                self.logger.debug(f"预评分过低({score:.1f})，跳过AI评分: {job.job_name}")
+                continue
+            if score < threshold:
+                self._prescore_stats['uncertain'] += 1
+            passed.append(job)
+        return passed
+        
+    def _score_stage(self, stage_config: Dict) -> BatchStage:
+        """AI评分阶段按批提交；不使用AI时批大小为1，职位直接通过不等待攒批"""
+        return BatchStage(
+            'score',
+            self._stage_score,
+            stage_config.get('concurrency', 2),
+            stage_config.get('buffer', 20),
+            batch_size=stage_config.get('batch_size', 5) if self._use_ai_score() else 1,
+            max_wait=stage_config.get('max_wait_ms', 2000) / 1000
+        )
+        
+    async def _stage_score(self, jobs: List[Job]) -> List[Job]:
+        """AI匹配度分析（批量）"""
+        if not self._use_ai_score():
+            return jobs
+        try:
+            analyses = await self.ai_service.analyze_jobs_batch(jobs)
+        except Exception as e:
+            self.logger.error(f"AI分析失败: {str(e)}")
+            return jobs
+        min_score = self.config.get('min_match_score', 60)
+        passed = []
+        for job in jobs:
+            analysis = analyses[job.job_id]
+            if analysis.get('match_score', 0) < min_score:
+                self.logger.info(f"匹配度过低({analysis.get('match_score', 0)}分)，跳过投递: {job.job_name}")
+                continue
+            # 保存分析结果
+            job.ai_analysis = analysis
+            passed.append(job)
+        return passed
+        
+    async def _stage_greeting(self, job: Job) -> Optional[Job]:
+        """生成打招呼语"""
+        greeting = self.config['platforms'][self.platform_name].get('default_greeting', '')
+        if self.ai_service is not None and self.config.get('enable_ai', False):
+            try:
+                greeting = await self.ai_service.generate_greeting(job)
+            except Exception as e:
+                self.logger.error(f"AI生成打招呼语失败: {str(e)}")
+                
+        # 格式化打招呼语
+        job.greeting = greeting.format(
+            company_name=job.company_name,
+            job_name=job.job_name
+        )
+        return job
+        
+    async def _stage_deliver(self, job: Job) -> Optional[Job]:
+        """检查投递限制并提交投递；每日配额用完后停止整条流水线，不再继续搜索和评分"""
+        if self._delivered >= self._max_jobs:
+            # 停止后未投递的职位不计为已处理，翻页进度不会越过它们
+            self.pipeline.stop()
+            return None
+        if not await self._wait_delivery_quota():
+            self.logger.warning(f"已达到每日投递限制: {self.quota.daily_limit}，停止搜索")
+            self.pipeline.stop()
+            return None
+        # 投递间隔由 deliver 令牌桶控制
+        success = await self._deliver_job(job)
+        if not success:
+            return None
+        self.quota.record()
+        self._delivered += 1
+        return job
+        
+    async def _stage_record(self, job: Job) -> Optional[Job]:
+        """记录投递结果并通知"""
+        self.analyzer.add_job(job)
+        if self.account:
+            self.store.mark_claim_applied(self.platform_name, job.job_id, self.account)
+        await self.notifier.notify_delivery(job, True)
+        if self._delivered >= self._max_jobs:
+            self.logger.info(f"达到最大投递数量: {self._max_jobs}")
+            self.pipeline.stop()
+        return job
+        
+    def _url(self, path: str, host: str = 'default') -> str:
+        """拼接接口地址；platforms.<name>.base_url 会替换所有默认地址（如指向本地模拟服务）"""
+        base_url = self.config['platforms'].get(self.platform_name, {}).get('base_url')
+        return (base_url or self.base_urls[host]).rstrip('/') + path
+        
+    def _load_cookies(self, cookies_str: str):
+        """解析Cookie字符串，保存为本平台的Cookie"""
+        for item in cookies_str.split(';'):
+            if '=' in item:
+                key, value = item.strip().split('=', 1)
+                self.cookies[key] = value
+                
+    async def _request(self, method: str, url: str, raw: bool = False,
+                       action: Optional[str] = None, **kwargs):
+        """通过共享传输层发送请求
+        Args:
+            raw: 为True时返回响应文本，否则解析为JSON
+            action: 请求类型（search/detail/deliver/login_check），指定时先从
+                对应令牌桶取令牌，并根据响应是否被限流调整速率
+        Returns:
+            (status, data): HTTP状态码和响应内容
+        """
+        if action:
+            await self.rate_limiter.acquire(self.platform_name, action)
+        if self.proxy:
+            kwargs.setdefault('proxy', self.proxy)
+        async with self.http.request(method, url, cookies=self.cookies, **kwargs) as response:
+            # 服务端下发的Cookie只保存在本平台实例中
+            for key, morsel in response.cookies.items():
+                self.cookies[key] = morsel.value
+            if raw:
+                data = await response.text()
+            else:
+                data = await response.json(content_type=None)
+        if action:
+            message = str(data.get('message', '')) if isinstance(data, dict) else ''
+            throttled = response.status == 429 or self.rate_limiter.is_throttle_message(message)
+            self.rate_limiter.report(self.platform_name, action, throttled)
+        return response.status, data
+            
+    async def _cached_request(self, method: str, url: str, cache_params: Dict, **kwargs) -> Dict:
+        """带磁盘缓存的请求，缓存键为 (platform, endpoint, 请求参数)，只缓存成功的响应"""
+        key = self.response_cache.make_key(self.platform_name, url, cache_params)
+        data = self.response_cache.get(key)
+        if data is not None:
+            return data
+            
+        status, data = await self._request(method, url, **kwargs)
+        if status == 200 and isinstance(data, dict) and data.get('code') == self.success_code:
+            self.response_cache.set(key, data)
+        return data
     
-    def _should_skip_job(self, job: Dict) -> bool:
+    def _should_skip_job(self, job: Job) -> bool:
         """检查是否应该跳过该职位"""
-        if job['company_name'] in self.blacklist['blackCompanies']:
+        # 1. 黑名单公司
+        if self.blacklist.match_company(job.company_name):
             return True
             
-        for keyword in self.blacklist['blackJobs']:
-            if keyword in job['job_name']:
-                return True
-                
-        min_salary, max_salary = self._parse_salary(job['salary'])
-        if not (self.config['job_preferences']['expected_salary'][0] <= max_salary and 
-                min_salary <= self.config['job_preferences']['expected_salary'][1]):
+        # 2. 关键词过滤（职位名和描述）
+        if self.blacklist.match_keywords(job.job_name, job.job_desc):
+            return True
+            
+        # 3. 招聘者过滤
+        if self.blacklist.match_recruiter(job.recruiter):
+            return True
+            
+        # 4. 行业过滤
+        if job.industry and job.industry in self.config['job_preferences'].get('excluded_industries', []):
             return True
             
+        # 5. 薪资过滤（按年薪比较，期望薪资为月薪k；面议等未解析的不过滤）
+        expected_range = self.config['job_preferences'].get('expected_salary', [])
+        if len(expected_range) == 2 and job.salary_max:
+            if not (expected_range[0] * 12 <= job.salary_max * job.salary_months and
+                    job.salary_min * job.salary_months <= expected_range[1] * 12):
+                return True
+                
         return False
     
-    def random_sleep(self, min_sec=2, max_sec=5):
-        """随机延迟"""
-        time.sleep(random.uniform(min_sec, max_sec))
-    
-    def _parse_salary(self, salary_text: str) -> tuple[int, int]:
-        """解析薪资范围
-        Args:
-            salary_text: 如 "15k-20k" 或 "15-20k" 或 "15K-20K"
-        Returns:
-            (min_salary, max_salary): 如 (15, 20)
-        """
-        try:
-            # 统一格式
-            salary = salary_text.lower().replace('k', '').replace('K', '')
-            min_s, max_s = salary.split('-')
-            return int(min_s), int(max_s)
-        except Exception as e:
-            self.logger.error(f"薪资解析失败 {salary_text}: {str(e)}")
-            return 0, 0
\ No newline at end of file
+    def _check_job_requirements(self, job: Job) -> bool:
+        """检查职位是否满足要求"""
+        # 检查工作年限
+        if job.work_year and '应届' not in job.work_year:
+            try:
+                min_year = int(job.work_year.split('-')[0])
+                if min_year > self.config['job_preferences']['max_work_year']:
+                    return False
+            except:
+                pass
+                
+        # 检查学历要求
+        if job.education:
+            education_level = {
+                '博士': 5, '硕士': 4, '本科': 3, '大专': 2, '高中': 1
+            }
+            required_level = education_level.get(job.education, 0)
+            my_level = education_level.get(
+                self.config['job_preferences']['education'],
+                3
+            )
+            if required_level > my_level:
+                return False
+                
+        return True
+        
+    def _apply_salary(self, job: Job):
+        """解析职位薪资文本，结果保存在职位上供后续阶段使用"""
+        salary = parse_salary(job.salary)
+        if salary is not None:
+            job.salary_min, job.salary_max, job.salary_months = salary
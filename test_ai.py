@@ -2,6 +2,7 @@ import asyncio
 import json
 import os
 from utils.ai_service import AIService
+from utils.job import Job
 import logging
 
 # 设置日志
@@ -32,17 +33,18 @@ test_config = {
 }
 
 # 测试用职位数据
-test_job = {
-    "job_name": "Python开发工程师",
-    "company_name": "测试科技有限公司",
-    "company_size": "500-1000人",
-    "company_stage": "C轮",
-    "city": "北京",
-    "salary": "25-35K",
-    "work_year": "3-5年",
-    "education": "本科",
-    "job_tags": ["Python", "Django", "Redis", "MySQL"],
-    "job_desc": """岗位职责：
+test_job = Job(
+    job_id="test_job",
+    job_name="Python开发工程师",
+    company_name="测试科技有限公司",
+    company_size="500-1000人",
+    company_stage="C轮",
+    city="北京",
+    salary="25-35K",
+    work_year="3-5年",
+    education="本科",
+    job_tags=["Python", "Django", "Redis", "MySQL"],
+    job_desc="""岗位职责：
 1. 负责公司核心业务系统的开发和维护
 2. 参与系统架构设计和技术方案制定
 3. 解决系统性能瓶颈，优化系统架构
@@ -54,7 +56,7 @@ test_job = {
 3. 熟练掌握Python、Django、Redis、MySQL
 4. 有大型项目开发经验优先
 5. 良好的团队协作能力和沟通能力"""
-}
+)
 
 async def test_chat_completion():
     """测试基础对话功能"""
@@ -100,7 +102,7 @@ async def test_keyword_extraction():
     print("\n=== 测试关键词提取 ===")
     try:
         ai_service = AIService(test_config)
-        keywords = await ai_service.extract_job_keywords(test_job["job_desc"])
+        keywords = await ai_service.extract_job_keywords(test_job.job_desc)
         print("\n提取的关键词:")
         print(json.dumps(keywords, indent=2, ensure_ascii=False))
         assert isinstance(keywords, dict)
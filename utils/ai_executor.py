@@ -0,0 +1,178 @@
+import time
+import heapq
+import random
+import asyncio
+import itertools
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from utils.exceptions import AIRateLimitError
+
+# 优先级数值越小越先执行：打招呼语在投递路径上，优先于评分
+PRIORITY_GREETING = 0
+PRIORITY_SCORE = 1
+PRIORITY_DEFAULT = 2
+
+class AIExecutor:
+    """AI请求调度器
+
+    同时进行的请求数不超过 max_concurrency；最近一分钟的请求数和 token 数
+    分别不超过 rpm / tpm。请求开始时按估算的 token 数预占预算，完成后按
+    响应中的 usage 修正。预算不足时请求按优先级排队。收到 429 时整体暂停
+    （优先使用 Retry-After，否则指数退避）后重试。
+    """
+
+    def __init__(self, max_concurrency: int = 4, rpm: int = 60, tpm: int = 100000,
+                 max_retries: int = 3, backoff_base: float = 2.0, max_backoff: float = 60.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._active = 0
+        self._waiting: List[list] = []  # [priority, seq, tokens, future]
+        self._seq = itertools.count()
+        self._window = deque()  # [开始时间, token数]，只保留最近一分钟
+        self._window_tokens = 0
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.completed = 0
+        self.throttled_count = 0
+        self.tokens_used = 0
+
+    async def run(self, call: Callable[[], Awaitable[Tuple[Any, Optional[int]]]],
+                  priority: int = PRIORITY_DEFAULT, tokens: int = 0) -> Any:
+        """在预算内执行一次请求
+        call 返回 (结果, 实际使用的token数)；tokens 为预估的token数，用于预占预算
+        """
+        for attempt in range(self.max_retries + 1):
+            entry = await self._acquire(priority, tokens)
+            used = None
+            try:
+                result, used = await call()
+                self.completed += 1
+                return result
+            except AIRateLimitError as e:
+                self._throttled(e.retry_after, attempt)
+                if attempt >= self.max_retries:
+                    raise
+            finally:
+                self._release(entry, used)
+
+    async def _acquire(self, priority: int, tokens: int) -> list:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._reset(loop)
+        future = loop.create_future()
+        heapq.heappush(self._waiting, [priority, next(self._seq), tokens, future])
+        self._dispatch()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 已获得执行资格但调用方被取消，归还并发名额
+                self._release(future.result(), 0)
+            raise
+
+    def _reset(self, loop: asyncio.AbstractEventLoop):
+        """事件循环变化（如定时任务每次 asyncio.run）时丢弃旧循环的定时器、排队请求和并发计数"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._waiting = []
+        self._active = 0
+        self._loop = loop
+
+    def _release(self, entry: list, used: Optional[int]):
+        self._active -= 1
+        if used is not None:
+            # 按实际用量修正预占的 token 数
+            self._window_tokens += used - entry[1]
+            entry[1] = used
+            self.tokens_used += used
+        self._dispatch()
+
+    def _dispatch(self):
+        """按优先级放行排队的请求，预算不足时定时重试"""
+        while self._waiting and self._active < self.max_concurrency:
+            priority, _, tokens, future = self._waiting[0]
+            if future.done():
+                heapq.heappop(self._waiting)
+                continue
+            wait = self._budget_wait(tokens)
+            if wait > 0:
+                self._schedule(wait)
+                return
+            heapq.heappop(self._waiting)
+            entry = [time.monotonic(), tokens]
+            self._window.append(entry)
+            self._window_tokens += tokens
+            self._active += 1
+            future.set_result(entry)
+
+    def _budget_wait(self, tokens: int) -> float:
+        """还需等待多久才能发起请求，0 表示可以立即发起"""
+        now = time.monotonic()
+        while self._window and self._window[0][0] <= now - 60:
+            self._window_tokens -= self._window.popleft()[1]
+        if now < self._paused_until:
+            return self._paused_until - now
+        if not self._window:
+            return 0
+        if len(self._window) >= self.rpm or self._window_tokens + tokens > self.tpm:
+            return self._window[0][0] + 60 - now
+        return 0
+
+    def _schedule(self, wait: float):
+        if self._timer is not None:
+            return
+        loop = asyncio.get_running_loop()
+
+        def fire():
+            self._timer = None
+            self._dispatch()
+        self._timer = loop.call_later(wait, fire)
+
+    def _throttled(self, retry_after: float, attempt: int):
+        """收到 429：所有请求暂停一段时间"""
+        self.throttled_count += 1
+        delay = retry_after or min(self.max_backoff, self.backoff_base * (2 ** attempt))
+        delay *= random.uniform(1, 1.2)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.logger.warning(f"AI接口限流，暂停 {delay:.1f} 秒")
+
+    def stats(self) -> Dict:
+        """并发、排队和最近一分钟的预算使用情况"""
+        self._budget_wait(0)
+        return {
+            "active": self._active,
+            "waiting": len(self._waiting),
+            "completed": self.completed,
+            "throttled": self.throttled_count,
+            "tokens_used": self.tokens_used,
+            "last_minute_requests": len(self._window),
+            "last_minute_tokens": self._window_tokens
+        }
+
+_executor: Optional[AIExecutor] = None
+
+def get_ai_executor(config: Optional[Dict] = None) -> AIExecutor:
+    """获取进程级共享的AI请求调度器，配置在 ai.executor 下"""
+    global _executor
+    if _executor is None:
+        executor_config = (config or {}).get('ai', {}).get('executor', {})
+        _executor = AIExecutor(
+            max_concurrency=executor_config.get('max_concurrency', 4),
+            rpm=executor_config.get('rpm', 60),
+            tpm=executor_config.get('tpm', 100000),
+            max_retries=executor_config.get('max_retries', 3),
+            backoff_base=executor_config.get('backoff_base', 2.0),
+            max_backoff=executor_config.get('max_backoff', 60.0)
+        )
+    return _executor
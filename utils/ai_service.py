@@ -1,11 +1,17 @@
-import openai
 import json
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import os
 from datetime import datetime
 import logging
 from enum import Enum
-import httpx
+import aiohttp
+import numpy as np
+from utils.http_client import get_http_client
+from utils.exceptions import AIRateLimitError, AIServiceError
+from utils.job import Job
+from utils.response_cache import get_response_cache
+from utils.ai_executor import PRIORITY_DEFAULT, PRIORITY_GREETING, PRIORITY_SCORE, get_ai_executor
+from utils.vector_store import get_vector_store
 
 class ModelProvider(Enum):
     """AI模型提供商"""
@@ -14,6 +20,68 @@ class ModelProvider(Enum):
     ANTHROPIC = "anthropic"
     CUSTOM = "custom"
 
+# 职位匹配分析的提示词；缓存键包含提示词全文，修改后旧的分析结果自动失效
+JOB_MATCH_SYSTEM_PROMPT = "你是一位专业的HR顾问。"
+JOB_MATCH_PROMPT = """
+作为一位资深HR和职业顾问，请详细分析这个职位与求职者的匹配程度：
+
+职位详细信息：
+1. 职位名称：{job_name}
+2. 公司信息：{company_name}（规模：{company_size}）
+3. 地点要求：{city}
+4. 薪资范围：{salary}
+5. 工作年：{work_year}
+6. 学历要求：{education}
+7. 技能要求：{job_tags}
+8. 职位描述：{job_desc}
+
+求职者背景：
+{introduce}
+
+请从以下维度进行分析：
+1. 技能匹配度(0-100)：技术栈、工具、平台的匹配程度
+2. 经验匹配度(0-100)：工作年限、项目经验的匹配程度
+3. 行业匹配度(0-100)：行业背景、业务领域的匹配程度
+4. 职业发展(0-100)：职位对职业成长的帮助程度
+5. 综合评分(0-100)：总体匹配程度
+
+并提供：
+1. 最突出的3个优势
+2. 最主要的3个不足
+3. 3-5条具体的改进建议
+4. 是否建议投递的结论和理由
+
+只返回一个JSON对象，格式如下：
+{{"match_score": 综合评分, "skill_score": 0, "experience_score": 0, "industry_score": 0,
+"growth_score": 0, "advantages": [], "disadvantages": [], "suggestions": [],
+"recommend": true, "reason": ""}}
+"""
+
+# 批量评分：背景和评分说明只发送一次，一次请求评估多个职位
+JOB_BATCH_SYSTEM_PROMPT = "你是一位专业的HR顾问，只输出JSON。"
+JOB_BATCH_PROMPT = """
+作为一位资深HR和职业顾问，请分别分析下列每个职位与求职者的匹配程度。
+
+求职者背景：
+{introduce}
+
+职位列表（JSON）：
+{jobs}
+
+对每个职位从以下维度评分(0-100)：技能匹配度、经验匹配度、行业匹配度、职业发展、综合评分，
+并给出最突出的优势、最主要的不足、改进建议以及是否建议投递的结论。
+
+只返回一个JSON数组，每个职位一项，格式如下：
+[{{"job_id": "职位ID", "match_score": 综合评分, "skill_score": 0, "experience_score": 0,
+"industry_score": 0, "growth_score": 0, "advantages": [], "disadvantages": [],
+"suggestions": [], "recommend": true, "reason": ""}}]
+"""
+
+# 打招呼语字数范围；流式生成时得到完整句子且达到下限即停止
+GREETING_MIN_CHARS = 50
+GREETING_MAX_CHARS = 100
+SENTENCE_ENDINGS = '。！？!?'
+
 class AIService:
     def __init__(self, config: Dict):
         self.config = config
@@ -25,6 +93,9 @@ class AIService:
         
         # 设置API配置
         self._setup_api()
+        self.cache = get_response_cache(config, 'ai')
+        self.executor = get_ai_executor(config)
+        self.vector_store = get_vector_store(config)
         
     def _setup_api(self):
         """设置API配置"""
@@ -55,15 +126,15 @@ class AIService:
             if not self.model:
                 raise ValueError(f"未设置 {self.provider.value} 的模型名称")
                 
-            # 配置API客户端
-            self.client = openai.AsyncOpenAI(
-                api_key=self.api_key,
-                base_url=self.api_base,
-                http_client=httpx.AsyncClient(
-                    verify=False,  # 禁用SSL验证
-                    timeout=30.0   # 设置超时时间
-                )
-            )
+            # 使用进程级共享的HTTP连接池，直接调用OpenAI兼容接口
+            self.http = get_http_client(self.config)
+            self.completions_url = f"{self.api_base.rstrip('/')}/chat/completions"
+            self.embeddings_url = f"{self.api_base.rstrip('/')}/embeddings"
+            self.embedding_settings = self.config['ai'].get('embedding', {})
+            self.headers = {
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json'
+            }
             
             self.logger.info(f"已配置 {self.provider.value} API")
             
@@ -71,8 +142,16 @@ class AIService:
             self.logger.error(f"API配置失败: {str(e)}")
             raise
             
-    async def chat_completion(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        """通用的AI对话接口"""
+    async def chat_completion(self, prompt: str, system_prompt: Optional[str] = None,
+                              max_tokens: Optional[int] = None,
+                              priority: int = PRIORITY_DEFAULT,
+                              timeout: Optional[float] = None,
+                              stream: bool = False,
+                              stop: Optional[Callable[[str], bool]] = None) -> str:
+        """通用的AI对话接口，max_tokens 缺省取 ai.settings.max_tokens，timeout 缺省30秒
+        请求经 AIExecutor 调度：受并发数和 RPM/TPM 预算限制，按 priority 排队，429 时退避重试。
+        stream 为 True 时以 SSE 流式接收，stop(已收到的文本) 返回 True 时立即断开，不再等待剩余输出
+        """
         try:
             messages = []
             if system_prompt:
@@ -92,88 +171,312 @@ class AIService:
             self.logger.debug(f"Model: {self.model}")
             self.logger.debug(f"Messages: {messages}")
             
-            try:
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=self.config['ai']['settings'].get('temperature', 0.7),
-                    max_tokens=self.config['ai']['settings'].get('max_tokens', 1000),
-                    top_p=self.config['ai']['settings'].get('top_p', 0.7),
-                    frequency_penalty=self.config['ai']['settings'].get('frequency_penalty', 0.5)
-                )
-                return response.choices[0].message.content
-                
-            except openai.APIConnectionError as e:
-                self.logger.error(f"API连接错误: {str(e)}")
-                raise
-            except openai.APIError as e:
-                self.logger.error(f"API错误: {str(e)}")
-                raise
-            except Exception as e:
-                self.logger.error(f"未知错误: {str(e)}")
-                raise
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": self.config['ai']['settings'].get('temperature', 0.7),
+                "max_tokens": max_tokens or self.config['ai']['settings'].get('max_tokens', 1000),
+                "top_p": self.config['ai']['settings'].get('top_p', 0.7),
+                "frequency_penalty": self.config['ai']['settings'].get('frequency_penalty', 0.5)
+            }
+            # 中文约一个字一个token，按提示词长度加上最大输出预估
+            estimate = len(prompt) + len(system_prompt or '') + payload['max_tokens']
+            if stream:
+                call = lambda: self._stream_completion(payload, timeout or 30, stop)
+            else:
+                call = lambda: self._post_completion(payload, timeout or 30)
+            return await self.executor.run(call, priority, estimate)
                 
         except Exception as e:
             self.logger.error(f"API请求失败: {str(e)}")
             raise
+
+    async def _post_completion(self, payload: Dict, timeout: float = 30) -> Tuple[str, Optional[int]]:
+        """发送一次对话请求，返回 (回复内容, 实际使用的token数)"""
+        data = await self._post_json(self.completions_url, payload, timeout)
+        usage = data.get('usage') or {}
+        return data['choices'][0]['message']['content'], usage.get('total_tokens')
+
+    async def _stream_completion(self, payload: Dict, timeout: float,
+                                 stop: Optional[Callable[[str], bool]]) -> Tuple[str, Optional[int]]:
+        """流式对话请求：逐个读取 SSE 数据块，满足 stop 条件时提前断开连接"""
+        text = ''
+        try:
+            async with self.http.request(
+                'POST',
+                self.completions_url,
+                json={**payload, "stream": True},
+                headers=self.headers,
+                ssl=False,  # 禁用SSL验证
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                await self._check_status(response)
+                async for line in response.content:
+                    line = line.decode('utf-8').strip()
+                    if not line.startswith('data:'):
+                        continue
+                    data = line[5:].strip()
+                    if data == '[DONE]':
+                        break
+                    choices = json.loads(data).get('choices') or [{}]
+                    text += (choices[0].get('delta') or {}).get('content') or ''
+                    if stop is not None and stop(text):
+                        # 已得到完整结果，关闭连接让服务端停止生成
+                        response.close()
+                        break
+            return text, None
             
-    async def analyze_job_match(self, job: Dict, resume: Dict) -> Dict:
-        """分析职位与简历的匹配度"""
-        prompt = f"""
-作为一位资深HR和职业顾问，请详细分析这个职位与求职者的匹配程度：
+        except aiohttp.ClientError as e:
+            self.logger.error(f"API连接错误: {str(e)}")
+            raise
+        except AIServiceError as e:
+            self.logger.error(f"API错误: {str(e)}")
+            raise
+        except Exception as e:
+            self.logger.error(f"未知错误: {str(e)}")
+            raise
 
-职位详细信息：
-1. 职位名称：{job['job_name']}
-2. 公司信息：{job['company_name']}（规模：{job.get('company_size', '未知')}）
-3. 地点要求：{job['city']}
-4. 薪资范围：{job['salary']}
-5. 工作年：{job.get('work_year', '不限')}
-6. 学历要求：{job.get('education', '不限')}
-7. 技能要求：{', '.join(job.get('job_tags', []))}
-8. 职位描述：{job.get('job_desc', '')}
+    async def _check_status(self, response: aiohttp.ClientResponse):
+        """429 转为 AIRateLimitError 交给调度器重试，其他非200状态抛出 AIServiceError"""
+        if response.status == 429:
+            retry_after = response.headers.get('Retry-After', '')
+            raise AIRateLimitError(
+                f"HTTP 429: {await response.text()}",
+                float(retry_after) if retry_after.replace('.', '', 1).isdigit() else 0
+            )
+        if response.status != 200:
+            raise AIServiceError(f"HTTP {response.status}: {await response.text()}")
 
-求职者背景：
-{self.config['ai']['introduce']}
+    async def _post_json(self, url: str, payload: Dict, timeout: float = 30) -> Dict:
+        """POST 到OpenAI兼容接口并返回JSON"""
+        try:
+            async with self.http.request(
+                'POST',
+                url,
+                json=payload,
+                headers=self.headers,
+                ssl=False,  # 禁用SSL验证
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                await self._check_status(response)
+                return await response.json(content_type=None)
+            
+        except aiohttp.ClientError as e:
+            self.logger.error(f"API连接错误: {str(e)}")
+            raise
+        except AIServiceError as e:
+            self.logger.error(f"API错误: {str(e)}")
+            raise
+        except Exception as e:
+            self.logger.error(f"未知错误: {str(e)}")
+            raise
+            
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """调用 /embeddings 获取文本向量，按 ai.embedding.batch_size 分批，返回 float32 矩阵"""
+        model = self.embedding_settings.get('model', 'BAAI/bge-m3')
+        batch_size = self.embedding_settings.get('batch_size', 32)
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i:i + batch_size]
+            payload = {"model": model, "input": batch, "encoding_format": "float"}
 
-请从以下维度进行分析：
-1. 技能匹配度(0-100)：技术栈、工具、平台的匹配程度
-2. 经验匹配度(0-100)：工作年限、项目经验的匹配程度
-3. 行业匹配度(0-100)：行业背景、业务领域的匹配程度
-4. 职业发展(0-100)：职位对职业成长的帮助程度
-5. 综合评分(0-100)：总体匹配程度
+            async def post(payload=payload):
+                data = await self._post_json(self.embeddings_url, payload)
+                items = sorted(data['data'], key=lambda item: item.get('index', 0))
+                usage = data.get('usage') or {}
+                return [item['embedding'] for item in items], usage.get('total_tokens')
 
-并提供：
-1. 最突出的3个优势
-2. 最主要的3个不足
-3. 3-5条具体的改进建议
-4. 是否建议投递的结论和理由
+            vectors.extend(await self.executor.run(
+                post, PRIORITY_SCORE, sum(len(text) for text in batch)
+            ))
+        return np.asarray(vectors, dtype=np.float32)
 
-请以JSON格式返回结果。
-"""
+    async def job_similarity(self, jobs: List[Job]) -> np.ndarray:
+        """职位与简历的向量相似度（0-100，取与各简历向量相似度的最大值）
+        职位向量按内容哈希存入向量库，每个职位只需计算一次
+        """
+        resume_keys = await self._ensure_embeddings(self._resume_texts())
+        if not resume_keys:
+            raise AIServiceError("没有可用于计算向量的简历内容")
+        keys, texts = [], {}
+        for job in jobs:
+            fields = self._job_fields(job)
+            key = self._embedding_key(fields)
+            keys.append(key)
+            texts[key] = f"{fields['job_name']}\n{fields['job_tags']}\n{fields['job_desc']}"
+        await self._ensure_embeddings(texts)
+        similarity = self.vector_store.similarity(keys, self.vector_store.get(resume_keys))
+        return similarity.max(axis=1) * 100
+
+    def _resume_texts(self) -> Dict[str, str]:
+        """简历向量的文本：ai.introduce 和技能列表各一条"""
+        skills = self.config.get('prescore', {}).get('skills') or self.config.get('resume', {}).get('skills') or []
+        texts = [self.config['ai'].get('introduce', ''), ', '.join(skills)]
+        return {self._embedding_key({'resume': text}): text for text in texts if text.strip()}
+
+    async def _ensure_embeddings(self, texts: Dict[str, str]) -> List[str]:
+        """向量库中缺失的文本一次性请求向量并写入，返回全部键"""
+        _, missing = self.vector_store.rows(list(texts))
+        if missing:
+            self.vector_store.add(missing, await self.embed([texts[key] for key in missing]))
+        return list(texts)
+
+    def _embedding_key(self, fields: Dict) -> str:
+        return self.cache.make_key('embedding', self.embedding_settings.get('model', 'BAAI/bge-m3'), fields)
+
+    async def analyze_job_match(self, job: Job, resume: Dict) -> Dict:
+        """分析职位与简历的匹配度（结果按内容缓存）"""
+        fields = self._job_fields(job)
+        analysis = await self.cache.get_or_fetch(
+            self._match_key(fields), lambda: self._analyze_job_match(fields), self
+        )
+        return analysis if analysis is not None else self._empty_analysis()
+
+    async def analyze_jobs_batch(self, jobs: List[Job]) -> Dict[str, Dict]:
+        """批量分析职位匹配度，返回 {job_id: 分析结果}
+        已缓存的职位不再请求；未缓存的职位每 ai.settings.batch_size 个合并为一次请求
+        """
+        results: Dict[str, Dict] = {}
+        pending = []
+        for job in jobs:
+            fields = self._job_fields(job)
+            key = self._match_key(fields)
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[job.job_id] = cached
+            else:
+                pending.append((job.job_id, fields, key))
+
+        batch_size = self.config['ai']['settings'].get('batch_size', 5)
+        for i in range(0, len(pending), batch_size):
+            await self._analyze_batch(pending[i:i + batch_size], results)
+        for job in jobs:
+            results.setdefault(job.job_id, self._empty_analysis())
+        return results
+
+    async def _analyze_batch(self, entries: List[tuple], results: Dict[str, Dict]):
+        """一次请求评估多个职位；结果缺失或格式不对的职位对半拆分后重试，单个职位走单独分析"""
+        if len(entries) == 1:
+            job_id, fields, key = entries[0]
+            analysis = await self._analyze_job_match(fields)
+            if analysis is not None:
+                self.cache.set(key, analysis)
+                results[job_id] = analysis
+            return
+
+        jobs = [{"job_id": job_id, **fields} for job_id, fields, _ in entries]
+        prompt = JOB_BATCH_PROMPT.format(
+            introduce=self.config['ai']['introduce'],
+            jobs=json.dumps(jobs, ensure_ascii=False)
+        )
+        per_job_tokens = self.config['ai']['settings'].get('batch_tokens_per_job', 300)
+        items = []
         try:
-            response = await self.chat_completion(prompt, "你是一位专业的HR顾问。")
-            return json.loads(response)
+            response = await self.chat_completion(
+                prompt, JOB_BATCH_SYSTEM_PROMPT,
+                max_tokens=per_job_tokens * len(entries), priority=PRIORITY_SCORE
+            )
+            items = self._parse_json(response)
+        except Exception as e:
+            self.logger.error(f"批量职位分析失败: {str(e)}")
+
+        by_id = {}
+        if isinstance(items, list):
+            by_id = {str(item.get('job_id')): item for item in items if isinstance(item, dict)}
+        failed = []
+        for job_id, fields, key in entries:
+            analysis = self._normalize_analysis(by_id.get(str(job_id)))
+            if analysis is None:
+                failed.append((job_id, fields, key))
+                continue
+            self.cache.set(key, analysis)
+            results[job_id] = analysis
+
+        if failed:
+            self.logger.warning(f"批量分析有 {len(failed)}/{len(entries)} 个职位失败，拆分重试")
+            middle = (len(failed) + 1) // 2
+            await self._analyze_batch(failed[:middle], results)
+            if failed[middle:]:
+                await self._analyze_batch(failed[middle:], results)
+
+    def _match_key(self, fields: Dict) -> str:
+        """匹配分析的缓存键；单个和批量分析的结果格式相同，共用一个键"""
+        return self.cache.make_key(
+            'job_match', self.model, self.config['ai']['introduce'],
+            JOB_MATCH_SYSTEM_PROMPT, JOB_MATCH_PROMPT,
+            JOB_BATCH_SYSTEM_PROMPT, JOB_BATCH_PROMPT, fields
+        )
+
+    @staticmethod
+    def _empty_analysis() -> Dict:
+        return {
+            "match_score": 0,
+            "advantages": [],
+            "disadvantages": [],
+            "suggestions": []
+        }
+
+    @staticmethod
+    def _normalize_analysis(analysis) -> Optional[Dict]:
+        """校验分析结果：必须有数值型 match_score（兼容返回中文键"综合评分"），否则返回None"""
+        if not isinstance(analysis, dict):
+            return None
+        score = analysis.get('match_score', analysis.get('综合评分'))
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            return None
+        analysis['match_score'] = score
+        return analysis
+
+    @staticmethod
+    def _parse_json(text: str):
+        """解析模型返回的JSON，兼容 ```json 代码块包裹"""
+        text = text.strip()
+        if text.startswith('```'):
+            text = text.split('\n', 1)[-1].rsplit('```', 1)[0]
+        return json.loads(text)
+
+    async def _analyze_job_match(self, fields: Dict) -> Optional[Dict]:
+        """请求AI分析，失败或结果无效时返回None（不写入缓存）"""
+        prompt = JOB_MATCH_PROMPT.format(introduce=self.config['ai']['introduce'], **fields)
+        try:
+            response = await self.chat_completion(prompt, JOB_MATCH_SYSTEM_PROMPT, priority=PRIORITY_SCORE)
+            analysis = self._normalize_analysis(self._parse_json(response))
         except Exception as e:
             self.logger.error(f"职位分析失败: {str(e)}")
-            return {
-                "match_score": 0,
-                "advantages": [],
-                "disadvantages": [],
-                "suggestions": []
-            }
+            return None
+        if analysis is None:
+            self.logger.error("职位分析失败: 返回结果缺少 match_score")
+        return analysis
+
+    @staticmethod
+    def _job_fields(job: Job) -> Dict[str, str]:
+        """规范化参与分析的职位字段：去掉多余空白，标签排序，使同一职位在不同搜索中得到相同的缓存键"""
+        def normalize(value) -> str:
+            return ' '.join(str(value or '').split())
+        return {
+            "job_name": normalize(job.job_name),
+            "company_name": normalize(job.company_name),
+            "company_size": normalize(job.company_size) or '未知',
+            "city": normalize(job.city),
+            "salary": normalize(job.salary),
+            "work_year": normalize(job.work_year) or '不限',
+            "education": normalize(job.education) or '不限',
+            "job_tags": ', '.join(sorted(normalize(tag) for tag in job.job_tags)),
+            "job_desc": normalize(job.job_desc)
+        }
             
-    async def generate_greeting(self, job: Dict) -> str:
+    async def generate_greeting(self, job: Job) -> str:
         """生成个性化打招呼语"""
         prompt = f"""
 请基于以下信息，生成一个个性化的专业打招呼语：
 
 职位信息：
-- 职位名称：{job['job_name']}
-- 公司名称：{job['company_name']}
-- 公司规模：{job.get('company_size', '未知')}
-- 融资阶段：{job.get('company_stage', '未知')}
-- 工作城市：{job['city']}
-- 技术要求：{', '.join(job.get('job_tags', []))}
+- 职位名称：{job.job_name}
+- 公司名称：{job.company_name}
+- 公司规模：{job.company_size or '未知'}
+- 融资阶段：{job.company_stage or '未知'}
+- 工作城市：{job.city}
+- 技术要求：{', '.join(job.job_tags)}
 
 我的背景：
 {self.config['ai']['introduce']}
@@ -183,20 +486,44 @@ class AIService:
 2. 突出与职位的匹配点
 3. 展现对公司的了解
 4. 表达真诚的求职意愿
-5. 字数控制在50-100字
+5. 字数控制在{GREETING_MIN_CHARS}-{GREETING_MAX_CHARS}字
 6. 语气专业且友好
 7. 可以适当展示自己的优势，但不要过度自夸
 """
+        settings = self.config['ai']['settings']
         try:
             response = await self.chat_completion(
                 prompt,
-                "你是一位专业的求职顾问，帮助生成合适的打招呼语。"
+                "你是一位专业的求职顾问，帮助生成合适的打招呼语。",
+                max_tokens=settings.get('greeting_max_tokens', 200),
+                priority=PRIORITY_GREETING,
+                timeout=settings.get('greeting_timeout', 15),
+                stream=True,
+                stop=self._greeting_complete
             )
-            return response.strip()
+            return self._trim_greeting(response)
         except Exception as e:
             self.logger.error(f"生成打招呼语失败: {str(e)}")
             return self.config['platforms']['boss']['default_greeting']
             
+    @staticmethod
+    def _greeting_complete(text: str) -> bool:
+        """已达到字数下限且以句末标点结束，或已超过字数上限"""
+        text = text.strip()
+        if len(text) > GREETING_MAX_CHARS:
+            return True
+        return len(text) >= GREETING_MIN_CHARS and text[-1] in SENTENCE_ENDINGS
+
+    @staticmethod
+    def _trim_greeting(text: str) -> str:
+        """超过字数上限时截断到上限内的最后一个完整句子"""
+        text = text.strip()
+        if len(text) <= GREETING_MAX_CHARS:
+            return text
+        head = text[:GREETING_MAX_CHARS]
+        end = max(head.rfind(mark) for mark in SENTENCE_ENDINGS)
+        return head[:end + 1] if end > 0 else head
+
     async def extract_job_keywords(self, job_desc: str) -> Dict:
         """提取职位关键词并分析"""
         prompt = f"""
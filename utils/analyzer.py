@@ -1,69 +1,53 @@
-from typing import Dict, List
-import json
+from typing import Callable, Dict, List, Optional
 from datetime import datetime
-import os
 import logging
+from utils.job_store import JobStore, get_job_store
+from utils.journal import DeliveryJournal, get_delivery_journal
+from utils.job import Job
 
 class JobAnalyzer:
-    def __init__(self):
-        self.jobs = []
+    def __init__(self, platform: str = 'boss', store: Optional[JobStore] = None,
+                 journal: Optional[DeliveryJournal] = None, account: str = ''):
+        self.platform = platform
+        self.account = account
+        self.store = store or get_job_store()
+        self.journal = journal or get_delivery_journal()
+        self.jobs: List[Job] = []
+        self._stats_sources: Dict[str, Callable[[], Dict]] = {}
         self.logger = logging.getLogger(self.__class__.__name__)
         
-    def add_job(self, job: Dict):
+    def add_job(self, job: Job):
         """添加职位记录"""
-        job['timestamp'] = datetime.now().isoformat()
+        job.timestamp = datetime.now().isoformat()
         self.jobs.append(job)
+        # 先写日志保证崩溃不丢记录，再标记为已投递，本轮后续搜索结果直接过滤
+        self.journal.append(self.platform, job, self.account)
+        self.store.mark_applied(self.platform, job.job_id)
         
     def save_records(self):
-        """保存投递记录"""
+        """把投递日志合并到已投递索引"""
         try:
-            # 创建数据目录
-            data_dir = 'data'
-            if not os.path.exists(data_dir):
-                os.makedirs(data_dir)
-                
-            # 按日期保存记录
-            date_str = datetime.now().strftime('%Y%m%d')
-            file_path = os.path.join(data_dir, f'job_records_{date_str}.json')
-            
-            # 读取已有记录
-            existing_records = []
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    existing_records = json.load(f)
-                    
-            # 合并记录
-            all_records = existing_records + self.jobs
-            
-            # 去重（根据job_id）
-            seen = set()
-            unique_records = []
-            for record in all_records:
-                job_id = record['job_id']
-                if job_id not in seen:
-                    seen.add(job_id)
-                    unique_records.append(record)
-                    
-            # 保存记录
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(unique_records, f, ensure_ascii=False, indent=2)
-                
-            self.logger.info(f"投递记录已保存到: {file_path}")
+            self.journal.compact(self.store)
+            self.logger.info(f"投递记录已保存到: {self.store.db_path}")
             
         except Exception as e:
             self.logger.error(f"保存投递记录失败: {str(e)}")
             
+    def add_stats_source(self, name: str, source: Callable[[], Dict]):
+        """注册额外的运行统计（如缓存命中率），随 get_statistics 一起输出"""
+        self._stats_sources[name] = source
+        
     def get_statistics(self) -> Dict:
         """获取简单统计"""
         total = len(self.jobs)
         if not total:
-            return {"total": 0}
+            return {"total": 0, **self._extra_statistics()}
             
-        companies = set(job['company_name'] for job in self.jobs)
-        cities = set(job['city'] for job in self.jobs)
+        companies = set(job.company_name for job in self.jobs)
+        cities = set(job.city for job in self.jobs)
         
         salary_sum = sum(
-            (job['salary_min'] + job['salary_max'])/2 
+            (job.salary_min + job.salary_max)/2 
             for job in self.jobs
         )
         
@@ -71,8 +55,12 @@ class JobAnalyzer:
             "total": total,
             "unique_companies": len(companies),
             "cities": list(cities),
-            "avg_salary": round(salary_sum / total, 2)
-        } 
+            "avg_salary": round(salary_sum / total, 2),
+            **self._extra_statistics()
+        }
+        
+    def _extra_statistics(self) -> Dict:
+        return {name: source() for name, source in self._stats_sources.items()}
 
     def generate_report(self) -> str:
         """生成简单的统计报告"""
@@ -84,7 +72,7 @@ class JobAnalyzer:
             f"目标公司数: {stats['unique_companies']}",
             f"目标城市: {', '.join(stats['cities'])}",
             f"平均薪资: {stats['avg_salary']}k",
-            "\n详细记录已保存到: data/job_records_*.json"
+            f"\n详细记录已保存到: {self.store.db_path}"
         ]
         
         return "\n".join(report)
\ No newline at end of file
@@ -0,0 +1,93 @@
+import re
+import os
+import json
+import time
+import logging
+from typing import Dict, List, Optional, Pattern
+
+DEFAULT_BLACKLIST = {
+    "companies": [],
+    "recruiters": ["猎头"],
+    "keywords": ["外包", "外派"]
+}
+
+# 兼容旧版字段名
+_LEGACY_KEYS = {
+    "companies": "blackCompanies",
+    "recruiters": "blackRecruiters",
+    "keywords": "blackJobs"
+}
+
+class BlacklistMatcher:
+    """黑名单匹配器
+
+    把 blacklist.json 中的关键词和招聘者列表各编译成一个正则（多模式一次
+    扫描），公司名用集合精确匹配。文件修改时间变化时自动重新编译，检查
+    频率由 check_interval 控制。
+    """
+
+    def __init__(self, path: str = 'blacklist.json', check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self.companies = frozenset()
+        self._keywords: Optional[Pattern] = None
+        self._recruiters: Optional[Pattern] = None
+        self._build(self._read())
+
+    def match_company(self, company_name: str) -> bool:
+        self._maybe_reload()
+        return company_name in self.companies
+
+    def match_keywords(self, *texts: str) -> bool:
+        """任一文本包含黑名单关键词（忽略大小写）"""
+        self._maybe_reload()
+        if self._keywords is None:
+            return False
+        return any(text and self._keywords.search(text) for text in texts)
+
+    def match_recruiter(self, recruiter: str) -> bool:
+        self._maybe_reload()
+        if self._recruiters is None or not recruiter:
+            return False
+        return self._recruiters.search(recruiter) is not None
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            self._build(self._read())
+            self.logger.info("黑名单已重新加载")
+
+    def _read(self) -> Dict[str, List[str]]:
+        try:
+            self._mtime = os.path.getmtime(self.path)
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            self._mtime = None
+            return DEFAULT_BLACKLIST
+        return {
+            key: data.get(key, data.get(legacy_key, []))
+            for key, legacy_key in _LEGACY_KEYS.items()
+        }
+
+    def _build(self, blacklist: Dict[str, List[str]]):
+        self.companies = frozenset(blacklist['companies'])
+        self._keywords = _compile(blacklist['keywords'])
+        self._recruiters = _compile(blacklist['recruiters'])
+
+def _compile(words: List[str]) -> Optional[Pattern]:
+    """把多个关键词编译为一个正则，长词优先"""
+    words = sorted({w for w in words if w}, key=len, reverse=True)
+    if not words:
+        return None
+    return re.compile('|'.join(re.escape(w) for w in words), re.IGNORECASE)
@@ -26,6 +26,21 @@ class LimitExceededError(JobBotError):
     """超出限制错误"""
     pass
 
+class SearchError(JobBotError):
+    """搜索接口请求失败（网络错误、限流或返回错误码）"""
+    pass
+
 class ProxyError(JobBotError):
     """代理相关错误"""
-    pass 
\ No newline at end of file
+    pass
+
+class AIServiceError(JobBotError):
+    """AI接口调用错误"""
+    pass
+
+class AIRateLimitError(AIServiceError):
+    """AI接口限流（HTTP 429）"""
+
+    def __init__(self, message: str, retry_after: float = 0):
+        super().__init__(message)
+        self.retry_after = retry_after
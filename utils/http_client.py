@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import aiohttp
+
+class HttpClient:
+    """进程级共享的异步HTTP传输层
+
+    所有平台和工具类共用同一个 aiohttp 连接池：长连接复用、单主机连接数
+    限制、DNS 缓存，gzip/deflate/br 由 aiohttp 自动解码（br 需安装 Brotli）。
+    Cookie 不放在共享会话中，由各调用方按请求传入，避免不同平台/账号互相污染。
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        http_config = (config or {}).get('http', {})
+        self.max_connections = http_config.get('max_connections', 100)
+        self.max_connections_per_host = http_config.get('max_connections_per_host', 8)
+        self.dns_cache_ttl = http_config.get('dns_cache_ttl', 300)
+        self.keepalive_timeout = http_config.get('keepalive_timeout', 30)
+        self.timeout = http_config.get('timeout', 30)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """当前事件循环上的共享会话，首次使用时创建；close() 之后同一事件循环上不再创建新会话"""
+        loop = asyncio.get_running_loop()
+        if loop is self._closed_loop:
+            raise RuntimeError("HttpClient已关闭")
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                cookie_jar=aiohttp.DummyCookieJar()
+            )
+            self._loop = loop
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs):
+        """发送请求，返回可用于 async with 的响应上下文"""
+        return self.session.request(method, url, **kwargs)
+
+    async def close(self):
+        """关闭连接池；之后的请求会失败，直到在新的事件循环上使用"""
+        self._closed_loop = asyncio.get_running_loop()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+_client: Optional[HttpClient] = None
+
+def get_http_client(config: Optional[Dict] = None) -> HttpClient:
+    """获取进程级共享的 HttpClient"""
+    global _client
+    if _client is None:
+        _client = HttpClient(config)
+    return _client
+
+async def close_http_client():
+    """关闭共享的 HttpClient（每次 asyncio.run 结束前调用）"""
+    if _client is not None:
+        await _client.close()
@@ -0,0 +1,97 @@
+import sys
+import zlib
+from typing import Dict, Iterable, Optional
+
+class Job:
+    """职位记录
+
+    各平台解析后统一产出的紧凑职位对象，使用 __slots__ 避免每条记录一个
+    dict。城市、学历、公司规模等高重复字段做字符串驻留；职位描述压缩保存，
+    访问 job_desc 时才解压。
+    """
+
+    __slots__ = (
+        'platform', 'job_id', 'job_name', 'company_name', 'salary', 'city',
+        'recruiter', 'recruiter_id', 'company_size', 'company_stage', 'work_year', 'education',
+        'job_tags', 'address', 'update_time', 'salary_min', 'salary_max',
+        'salary_months', 'lid', 'industry', 'timestamp', 'ai_analysis', 'greeting', '_desc'
+    )
+
+    def __init__(self, job_id: str, job_name: str = '', company_name: str = '',
+                 salary: str = '', city: str = '', platform: str = '', recruiter: str = '',
+                 recruiter_id: str = '', company_size: str = '',
+                 company_stage: str = '', work_year: str = '', education: str = '',
+                 job_tags: Iterable[str] = (), job_desc: str = '', address='',
+                 update_time='', salary_min: float = 0, salary_max: float = 0,
+                 salary_months: int = 12, lid: str = '', industry: str = '', timestamp: str = '',
+                 ai_analysis: Optional[Dict] = None, greeting: str = ''):
+        self.platform = _intern(platform)
+        self.job_id = job_id
+        self.job_name = job_name
+        self.company_name = company_name
+        self.salary = _intern(salary)
+        self.city = _intern(city)
+        self.recruiter = recruiter
+        self.recruiter_id = recruiter_id
+        self.company_size = _intern(company_size)
+        self.company_stage = _intern(company_stage)
+        self.work_year = _intern(work_year)
+        self.education = _intern(education)
+        self.job_tags = tuple(_intern(tag) for tag in job_tags)
+        self.address = _compact_address(address)
+        self.update_time = update_time
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.salary_months = salary_months
+        self.lid = lid
+        self.industry = _intern(industry)
+        self.timestamp = timestamp
+        self.ai_analysis = ai_analysis
+        self.greeting = greeting
+        self.job_desc = job_desc
+
+    @property
+    def job_desc(self) -> str:
+        """职位描述（按需解压）"""
+        return zlib.decompress(self._desc).decode('utf-8') if self._desc else ''
+
+    @job_desc.setter
+    def job_desc(self, value: str):
+        self._desc = zlib.compress(value.encode('utf-8')) if value else b''
+
+    @property
+    def has_desc(self) -> bool:
+        return bool(self._desc)
+
+    def to_dict(self) -> Dict:
+        """转换为可JSON序列化的字典"""
+        data = {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if not name.startswith('_')
+        }
+        data['job_tags'] = list(self.job_tags)
+        data['job_desc'] = self.job_desc
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Job':
+        """由字典（如旧版JSON记录）构建"""
+        fields = {
+            name: data[name]
+            for name in cls.__slots__
+            if not name.startswith('_') and name in data
+        }
+        return cls(job_desc=data.get('job_desc', ''), **fields)
+
+    def __repr__(self) -> str:
+        return f"Job({self.platform}:{self.job_id} {self.job_name} - {self.company_name})"
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _compact_address(address) -> str:
+    """地址对象只保留文本部分"""
+    if isinstance(address, dict):
+        return ' '.join(str(v) for v in address.values() if isinstance(v, (str, int)) and v)
+    return address or ''
@@ -0,0 +1,271 @@
+import sqlite3
+import json
+import os
+import glob
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from utils.job import Job
+
+class JobStore:
+    """已投递职位索引
+
+    基于 SQLite（WAL 模式），以 (platform, job_id) 为主键保存所有历史投递
+    和搜索中见过的职位，并在内存中缓存每个平台的 job_id 集合，供解析阶段
+    O(1) 查询。多账号运行时各进程共用同一个库，通过 claim 认领职位，保证
+    同一职位只由一个账号处理。
+    """
+
+    def __init__(self, db_path: str = 'data/jobbot.db'):
+        self.db_path = db_path
+        self.logger = logging.getLogger(self.__class__.__name__)
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_tables()
+        self._applied: Dict[str, Set[str]] = {}
+        self._seen: Dict[str, Set[str]] = {}
+        self._import_legacy_records()
+
+    def _create_tables(self):
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS applied_jobs (
+                platform TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                job_name TEXT,
+                company_name TEXT,
+                city TEXT,
+                salary TEXT,
+                salary_min REAL,
+                salary_max REAL,
+                applied_at TEXT NOT NULL,
+                data TEXT,
+                account TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (platform, job_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_applied_jobs_time
+                ON applied_jobs (platform, applied_at);
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                platform TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                PRIMARY KEY (platform, job_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS search_checkpoints (
+                platform TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                city TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                last_job_id TEXT,
+                finished INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (platform, keyword, city)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS job_claims (
+                platform TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                account TEXT NOT NULL,
+                claimed_at REAL NOT NULL,
+                applied INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (platform, job_id)
+            ) WITHOUT ROWID;
+        ''')
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(applied_jobs)')}
+        if 'account' not in columns:
+            self.conn.execute("ALTER TABLE applied_jobs ADD COLUMN account TEXT NOT NULL DEFAULT ''")
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(job_claims)')}
+        if 'applied' not in columns:
+            self.conn.execute("ALTER TABLE job_claims ADD COLUMN applied INTEGER NOT NULL DEFAULT 0")
+        self.conn.commit()
+
+    def is_applied(self, platform: str, job_id: str) -> bool:
+        """是否已经投递过该职位"""
+        return job_id in self._applied_ids(platform)
+
+    def mark_applied(self, platform: str, job_id: str):
+        """在内存中标记为已投递（持久化由 add_applied 完成）"""
+        self._applied_ids(platform).add(job_id)
+
+    def add_applied(self, platform: str, jobs: List[Job], account: str = ''):
+        """批量写入投递记录，已存在的 (platform, job_id) 保持不变"""
+        if not jobs:
+            return
+        rows = [
+            (
+                platform,
+                job.job_id,
+                job.job_name,
+                job.company_name,
+                job.city,
+                job.salary,
+                job.salary_min,
+                job.salary_max,
+                job.timestamp or datetime.now().isoformat(),
+                json.dumps(job.to_dict(), ensure_ascii=False, default=str),
+                account
+            )
+            for job in jobs
+        ]
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO applied_jobs '
+                '(platform, job_id, job_name, company_name, city, salary, '
+                'salary_min, salary_max, applied_at, data, account) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+        ids = self._applied_ids(platform)
+        ids.update(job.job_id for job in jobs)
+
+    def is_seen(self, platform: str, job_id: str) -> bool:
+        """是否在之前的搜索中见过该职位（已投递的也视为见过）"""
+        return job_id in self._seen_ids(platform) or self.is_applied(platform, job_id)
+
+    def mark_seen(self, platform: str, job_ids: List[str]):
+        """记录搜索中见过的职位"""
+        if not job_ids:
+            return
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO seen_jobs (platform, job_id, last_seen) VALUES (?, ?, ?)',
+                [(platform, job_id, now) for job_id in job_ids]
+            )
+        self._seen_ids(platform).update(job_ids)
+
+    def count_applied(self, platform: str, since: Optional[datetime] = None,
+                      account: Optional[str] = None) -> int:
+        """统计指定时间之后的投递数量，指定 account 时只统计该账号"""
+        sql = 'SELECT COUNT(*) FROM applied_jobs WHERE platform = ?'
+        params = [platform]
+        if since is not None:
+            sql += ' AND applied_at > ?'
+            params.append(since.isoformat())
+        if account is not None:
+            sql += ' AND account = ?'
+            params.append(account)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def applied_times(self, platform: str, since: datetime, account: Optional[str] = None) -> List[str]:
+        """指定时间之后的投递时间（ISO格式），按时间升序"""
+        sql = 'SELECT applied_at FROM applied_jobs WHERE platform = ? AND applied_at > ?'
+        params = [platform, since.isoformat()]
+        if account is not None:
+            sql += ' AND account = ?'
+            params.append(account)
+        return [row[0] for row in self.conn.execute(sql + ' ORDER BY applied_at', params)]
+
+    def claim(self, platform: str, job_id: str, account: str, ttl: float = 3600) -> bool:
+        """为账号认领职位（跨进程原子操作）
+        未被认领、已被本账号认领或他人认领已超过 ttl 秒时返回True；已投递的职位认领永久有效，
+        任何账号再认领都返回False
+        """
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO job_claims (platform, job_id, account, claimed_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (platform, job_id) DO UPDATE SET account = excluded.account, '
+                'claimed_at = excluded.claimed_at '
+                'WHERE job_claims.applied = 0 AND '
+                '(job_claims.account = excluded.account OR job_claims.claimed_at < ?)',
+                (platform, job_id, account, now, now - ttl)
+            )
+            row = self.conn.execute(
+                'SELECT account, applied FROM job_claims WHERE platform = ? AND job_id = ?',
+                (platform, job_id)
+            ).fetchone()
+        return row is not None and row[0] == account and not row[1]
+
+    def mark_claim_applied(self, platform: str, job_id: str, account: str):
+        """投递成功后把认领标记为已投递，使其不再过期（投递日志要到运行结束才合并进库）"""
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO job_claims (platform, job_id, account, claimed_at, applied) VALUES (?, ?, ?, ?, 1) '
+                'ON CONFLICT (platform, job_id) DO UPDATE SET applied = 1',
+                (platform, job_id, account, time.time())
+            )
+
+    def get_checkpoint(self, platform: str, keyword: str, city: str) -> Optional[Dict]:
+        """读取搜索单元的翻页进度"""
+        row = self.conn.execute(
+            'SELECT page, last_job_id, finished, updated_at FROM search_checkpoints '
+            'WHERE platform = ? AND keyword = ? AND city = ?',
+            (platform, keyword, city)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "page": row[0],
+            "last_job_id": row[1],
+            "finished": bool(row[2]),
+            "updated_at": datetime.fromisoformat(row[3])
+        }
+
+    def save_checkpoint(self, platform: str, keyword: str, city: str, page: int,
+                        last_job_id: Optional[str] = None, finished: bool = False):
+        """保存搜索单元已处理完的最后一页"""
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO search_checkpoints '
+                '(platform, keyword, city, page, last_job_id, finished, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (platform, keyword, city, page, last_job_id, int(finished), datetime.now().isoformat())
+            )
+
+    def _applied_ids(self, platform: str) -> Set[str]:
+        ids = self._applied.get(platform)
+        if ids is None:
+            ids = {
+                row[0] for row in self.conn.execute(
+                    'SELECT job_id FROM applied_jobs WHERE platform = ?', (platform,)
+                )
+            }
+            self._applied[platform] = ids
+        return ids
+
+    def _seen_ids(self, platform: str) -> Set[str]:
+        ids = self._seen.get(platform)
+        if ids is None:
+            ids = {
+                row[0] for row in self.conn.execute(
+                    'SELECT job_id FROM seen_jobs WHERE platform = ?', (platform,)
+                )
+            }
+            self._seen[platform] = ids
+        return ids
+
+    def _import_legacy_records(self):
+        """首次启动时导入旧版 data/job_records_*.json 记录"""
+        if self.conn.execute('SELECT 1 FROM applied_jobs LIMIT 1').fetchone():
+            return
+        data_dir = os.path.dirname(self.db_path) or '.'
+        for file_path in sorted(glob.glob(os.path.join(data_dir, 'job_records_*.json'))):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+                by_platform: Dict[str, List[Job]] = {}
+                for record in records:
+                    by_platform.setdefault(record.get('platform') or 'boss', []).append(Job.from_dict(record))
+                for platform, jobs in by_platform.items():
+                    self.add_applied(platform, jobs)
+                self.logger.info(f"已导入旧版投递记录: {file_path}")
+            except Exception as e:
+                self.logger.error(f"导入旧版投递记录失败 {file_path}: {str(e)}")
+
+    def close(self):
+        self.conn.close()
+
+_store: Optional[JobStore] = None
+
+def get_job_store(config: Optional[Dict] = None) -> JobStore:
+    """获取进程级共享的 JobStore"""
+    global _store
+    if _store is None:
+        db_path = (config or {}).get('storage', {}).get('db_path', 'data/jobbot.db')
+        _store = JobStore(db_path)
+    return _store
@@ -0,0 +1,127 @@
+import os
+import glob
+import json
+import time
+import asyncio
+import logging
+from datetime import date
+from typing import Dict, List, Optional
+from utils.job import Job
+from utils.job_store import JobStore, get_job_store
+
+class DeliveryJournal:
+    """投递日志
+
+    每次投递成功追加一行 JSON 到当天的 deliveries_YYYYMMDD.jsonl，写入后
+    立即 flush；fsync 按组提交，累计 fsync_every 条或距上次 fsync 超过
+    fsync_interval_ms 时执行。compact 把日志合并进 JobStore 后删除日志文件，
+    进程崩溃后残留的日志会在下次启动时合并。
+    """
+
+    def __init__(self, directory: str = 'data/journal', fsync_every: int = 10,
+                 fsync_interval_ms: int = 200):
+        self.directory = directory
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval_ms / 1000
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._file = None
+        self._file_day: Optional[date] = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._sync_handle: Optional[asyncio.TimerHandle] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, platform: str, job: Job, account: str = ''):
+        """追加一条投递记录"""
+        record = job.to_dict()
+        record['platform'] = platform
+        record['account'] = account
+        f = self._current_file()
+        f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        f.flush()
+        self._pending += 1
+        if (self._pending >= self.fsync_every or
+                time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+        else:
+            self._schedule_sync()
+
+    def sync(self):
+        """把已写入的记录刷到磁盘"""
+        if self._sync_handle is not None:
+            self._sync_handle.cancel()
+            self._sync_handle = None
+        if self._file is not None and self._pending:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def compact(self, store: JobStore):
+        """把所有日志合并进 JobStore（重复记录被忽略），成功后删除日志文件"""
+        self.close()
+        for path in sorted(glob.glob(os.path.join(self.directory, 'deliveries_*.jsonl'))):
+            try:
+                groups: Dict[tuple, List[Job]] = {}
+                for record in self._read(path):
+                    key = (record.get('platform') or 'boss', record.get('account', ''))
+                    groups.setdefault(key, []).append(Job.from_dict(record))
+                for (platform, account), jobs in groups.items():
+                    store.add_applied(platform, jobs, account)
+                os.remove(path)
+            except Exception as e:
+                self.logger.error(f"合并投递日志失败 {path}: {str(e)}")
+
+    def close(self):
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _current_file(self):
+        """按天轮转日志文件"""
+        today = date.today()
+        if self._file is None or self._file_day != today:
+            self.close()
+            path = os.path.join(self.directory, f"deliveries_{today:%Y%m%d}.jsonl")
+            self._file = open(path, 'a', encoding='utf-8')
+            self._file_day = today
+        return self._file
+
+    def _schedule_sync(self):
+        """在事件循环中安排一次延迟 fsync，保证空闲时记录也能在 T 毫秒内落盘"""
+        if self._sync_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._sync_handle = loop.call_later(self.fsync_interval, self.sync)
+
+    def _read(self, path: str) -> List[Dict]:
+        records = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 崩溃时可能留下写了一半的最后一行
+                    self.logger.warning(f"跳过损坏的日志行: {path}")
+        return records
+
+_journal: Optional[DeliveryJournal] = None
+
+def get_delivery_journal(config: Optional[Dict] = None) -> DeliveryJournal:
+    """获取进程级共享的投递日志，首次创建时合并上次运行残留的日志"""
+    global _journal
+    if _journal is None:
+        journal_config = (config or {}).get('journal', {})
+        _journal = DeliveryJournal(
+            journal_config.get('dir', 'data/journal'),
+            fsync_every=journal_config.get('fsync_every', 10),
+            fsync_interval_ms=journal_config.get('fsync_interval_ms', 200)
+        )
+        _journal.compact(get_job_store(config))
+    return _journal
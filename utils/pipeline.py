@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+class Stage:
+    """流水线阶段
+
+    func 接收一个元素，返回处理后的元素；返回 None 表示丢弃。
+    concurrency 为该阶段的并发数，buffer_size 为该阶段输入队列的容量。
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Awaitable[Optional[Any]]],
+                 concurrency: int = 1, buffer_size: int = 10):
+        self.name = name
+        self.func = func
+        self.concurrency = max(1, concurrency)
+        self.buffer_size = buffer_size
+        self.received = 0
+        self.passed = 0
+
+class BatchStage(Stage):
+    """批量处理阶段
+
+    func 接收一批元素（最多 batch_size 个），返回要继续传递的元素列表。
+    攒批时最多等待 max_wait 秒，不足一批也会提交，避免上游稀疏时长时间阻塞。
+    """
+
+    def __init__(self, name: str, func: Callable[[List[Any]], Awaitable[List[Any]]],
+                 concurrency: int = 1, buffer_size: int = 10, batch_size: int = 5,
+                 max_wait: float = 2.0):
+        super().__init__(name, func, concurrency, buffer_size)
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+
+class Pipeline:
+    """异步流水线：上游数据依次流经各阶段，阶段之间以有界队列连接
+
+    元素在某个阶段被丢弃（返回 None 或出错）或离开最后一个阶段时调用
+    on_done(元素)，供数据源据此控制预取；stop() 之后不再调用。
+    """
+
+    _DONE = object()
+
+    def __init__(self, stages: List[Stage], on_done: Optional[Callable[[Any], None]] = None):
+        self.stages = stages
+        self.on_done = on_done
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._stop_event: Optional[asyncio.Event] = None
+
+    def stop(self):
+        """提前结束流水线（如已达到投递上限），未处理的元素将被丢弃"""
+        if self._stop_event:
+            self._stop_event.set()
+
+    async def run(self, source: AsyncIterator[Any]):
+        """运行流水线直到数据源耗尽或被 stop()"""
+        self._stop_event = asyncio.Event()
+        queues = [asyncio.Queue(maxsize=stage.buffer_size) for stage in self.stages]
+        tasks = [asyncio.create_task(self._feed(source, queues[0]))]
+        for i, stage in enumerate(self.stages):
+            output = queues[i + 1] if i + 1 < len(self.stages) else None
+            tasks.append(asyncio.create_task(self._run_stage(stage, queues[i], output)))
+
+        stopper = asyncio.create_task(self._stop_event.wait())
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending | {stopper}, return_when=asyncio.FIRST_COMPLETED)
+                if stopper in done:
+                    break
+                pending.discard(stopper)
+                failed = [task for task in done if task.cancelled() or task.exception() is not None]
+                if failed:
+                    # 某个阶段异常退出后下游收不到结束标记，其余任务需一并取消
+                    error = 'cancelled' if failed[0].cancelled() else str(failed[0].exception())
+                    self.logger.error(f"流水线任务异常退出，停止流水线: {error}")
+                    break
+        finally:
+            stopper.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """各阶段的输入/输出数量"""
+        return {
+            stage.name: {"in": stage.received, "out": stage.passed}
+            for stage in self.stages
+        }
+
+    def _done(self, item: Any):
+        if self.on_done is None or (self._stop_event and self._stop_event.is_set()):
+            return
+        try:
+            self.on_done(item)
+        except Exception as e:
+            self.logger.error(f"流水线完成回调失败: {str(e)}")
+
+    async def _feed(self, source: AsyncIterator[Any], queue: asyncio.Queue):
+        try:
+            async for item in source:
+                await queue.put(item)
+        finally:
+            # 确保数据源（如搜索引擎）被关闭
+            if hasattr(source, 'aclose'):
+                await source.aclose()
+        await queue.put(self._DONE)
+
+    async def _run_stage(self, stage: Stage, input_queue: asyncio.Queue,
+                         output_queue: Optional[asyncio.Queue]):
+        worker = self._batch_worker if isinstance(stage, BatchStage) else self._worker
+        workers = [
+            asyncio.create_task(worker(stage, input_queue, output_queue))
+            for _ in range(stage.concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            for worker in workers:
+                worker.cancel()
+            raise
+        if output_queue is not None:
+            await output_queue.put(self._DONE)
+
+    async def _worker(self, stage: Stage, input_queue: asyncio.Queue,
+                      output_queue: Optional[asyncio.Queue]):
+        while True:
+            item = await input_queue.get()
+            if item is self._DONE:
+                # 让同阶段的其他 worker 也能收到结束标记
+                await input_queue.put(self._DONE)
+                return
+            stage.received += 1
+            try:
+                result = await stage.func(item)
+            except Exception as e:
+                self.logger.error(f"流水线阶段 {stage.name} 处理失败: {str(e)}")
+                self._done(item)
+                continue
+            if result is None:
+                self._done(item)
+                continue
+            stage.passed += 1
+            if output_queue is not None:
+                await output_queue.put(result)
+            else:
+                self._done(result)
+
+    async def _batch_worker(self, stage: BatchStage, input_queue: asyncio.Queue,
+                            output_queue: Optional[asyncio.Queue]):
+        loop = asyncio.get_running_loop()
+        done = False
+        while not done:
+            item = await input_queue.get()
+            if item is self._DONE:
+                await input_queue.put(self._DONE)
+                return
+            batch = [item]
+            deadline = loop.time() + stage.max_wait
+            while len(batch) < stage.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(input_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is self._DONE:
+                    await input_queue.put(self._DONE)
+                    done = True
+                    break
+                batch.append(item)
+
+            stage.received += len(batch)
+            try:
+                results = await stage.func(batch)
+            except Exception as e:
+                self.logger.error(f"流水线阶段 {stage.name} 处理失败: {str(e)}")
+                for item in batch:
+                    self._done(item)
+                continue
+            results = results or []
+            passed = {id(result) for result in results}
+            for item in batch:
+                if id(item) not in passed:
+                    self._done(item)
+            for result in results:
+                stage.passed += 1
+                if output_queue is not None:
+                    await output_queue.put(result)
+                else:
+                    self._done(result)
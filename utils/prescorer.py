@@ -0,0 +1,141 @@
+import os
+import re
+import zlib
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+from utils.job import Job
+
+_ASCII_WORD = re.compile(r'[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]')
+_CJK_RUN = re.compile(r'[一-鿿]+')
+
+def tokenize(text: str) -> List[str]:
+    """英文按单词切分，中文按相邻两字切分（不依赖分词库）"""
+    text = text.lower()
+    tokens = _ASCII_WORD.findall(text)
+    for run in _CJK_RUN.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+class PreScorer:
+    """本地预评分
+
+    把职位的 job_tags、job_name、job_desc 用特征哈希映射到 dim 维向量，
+    按 TF-IDF 加权后与简历技能向量求余弦相似度（0-100）。IDF 取自之前各次
+    运行累计并保存在 corpus_path 的文档频率，运行期间固定不变（首次运行没有
+    语料时 IDF 全为1），因此分数与职位到达的顺序无关；本次运行的职位在
+    save() 时才并入语料。每批职位一次矩阵运算完成，不请求网络。
+    """
+
+    # 各字段的词频权重：标签和职位名比描述更能代表职位要求
+    FIELD_WEIGHTS = (('job_tags', 2.0), ('job_name', 2.0), ('job_desc', 1.0))
+
+    def __init__(self, skills: Sequence[str], dim: int = 4096, corpus_path: Optional[str] = None):
+        self.dim = dim
+        self.corpus_path = corpus_path
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._df = np.zeros(dim, dtype=np.float64)
+        self._docs = 0
+        self._load_corpus()
+        self._idf = self._compute_idf()
+        # 本次运行新增的文档频率，save() 时并入语料
+        self._pending_df = np.zeros(dim, dtype=np.float64)
+        self._pending_docs = 0
+        self._resume = self._vectorize([(' '.join(skills), 1.0)])
+        self.enabled = bool(self._resume.any())
+
+    def _load_corpus(self):
+        if not self.corpus_path or not os.path.exists(self.corpus_path):
+            return
+        try:
+            with np.load(self.corpus_path) as corpus:
+                df, docs = corpus['df'], int(corpus['docs'])
+        except Exception as e:
+            self.logger.error(f"读取预评分语料失败: {str(e)}")
+            return
+        if df.shape != (self.dim,):
+            self.logger.warning(f"预评分语料维度不一致({df.shape[0]} != {self.dim})，忽略")
+            return
+        self._df, self._docs = df.astype(np.float64), docs
+
+    def _compute_idf(self) -> np.ndarray:
+        if not self._docs:
+            return np.ones(self.dim, dtype=np.float32)
+        return (np.log((1 + self._docs) / (1 + self._df)) + 1).astype(np.float32)
+
+    def save(self):
+        """把本次运行的文档频率并入语料并写回（先写临时文件再替换）"""
+        if not self.corpus_path or not self._pending_docs:
+            return
+        df = self._df + self._pending_df
+        docs = self._docs + self._pending_docs
+        directory = os.path.dirname(self.corpus_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.corpus_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, df=df, docs=docs)
+            os.replace(tmp_path, self.corpus_path)
+        except Exception as e:
+            self.logger.error(f"保存预评分语料失败: {str(e)}")
+            return
+        self._df, self._docs = df, docs
+        self._pending_df[:] = 0
+        self._pending_docs = 0
+
+    def _index(self, token: str) -> int:
+        return zlib.crc32(token.encode('utf-8')) % self.dim
+
+    def _vectorize(self, fields: Iterable[tuple]) -> np.ndarray:
+        """把 (文本, 权重) 列表转成词频向量"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for text, weight in fields:
+            indexes = [self._index(token) for token in tokenize(text)]
+            if indexes:
+                np.add.at(vector, indexes, weight)
+        return vector
+
+    def score(self, jobs: List[Job]) -> np.ndarray:
+        """批量计算预评分，返回与 jobs 顺序一致的 0-100 分数"""
+        if not jobs:
+            return np.zeros(0, dtype=np.float32)
+        tf = np.stack([
+            self._vectorize(
+                (' '.join(job.job_tags) if field == 'job_tags' else getattr(job, field) or '', weight)
+                for field, weight in self.FIELD_WEIGHTS
+            )
+            for job in jobs
+        ])
+        self._pending_df += (tf > 0).sum(axis=0)
+        self._pending_docs += len(jobs)
+        idf = self._idf
+
+        job_vectors = np.log1p(tf) * idf
+        resume_vector = (self._resume > 0) * idf
+        norms = np.linalg.norm(job_vectors, axis=1) * np.linalg.norm(resume_vector)
+        similarity = job_vectors @ resume_vector / np.where(norms > 0, norms, 1)
+        return (similarity * 100).astype(np.float32)
+
+def resume_skills(config: Dict) -> List[str]:
+    """简历技能：优先 prescore.skills，其次 resume.skills，最后退回 ai.introduce 全文"""
+    skills = config.get('prescore', {}).get('skills') or config.get('resume', {}).get('skills')
+    if skills:
+        return [skill for skill in skills if skill]
+    introduce = config.get('ai', {}).get('introduce', '')
+    return [introduce] if introduce else []
+
+def get_prescorer(config: Dict) -> Optional[PreScorer]:
+    """创建预评分器；未启用或没有可用的简历技能时返回None"""
+    prescore_config = config.get('prescore', {})
+    if not prescore_config.get('enabled', True):
+        return None
+    scorer = PreScorer(
+        resume_skills(config),
+        prescore_config.get('dim', 4096),
+        prescore_config.get('corpus_path', 'data/prescore_corpus.npz')
+    )
+    return scorer if scorer.enabled else None
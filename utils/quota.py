@@ -0,0 +1,99 @@
+import time
+import logging
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+from utils.job_store import JobStore, get_job_store
+from utils.journal import get_delivery_journal
+
+class DeliveryQuota:
+    """单个平台的投递配额
+
+    每日计数按自然日清零，每小时限制为最近一小时的滑动窗口（deque 中只
+    保留窗口内的投递时间）。启动时从 JobStore 读取一次当天和最近一小时的
+    投递记录，之后每次投递成功只更新内存，检查为均摊 O(1)。
+    """
+
+    def __init__(self, platform: str, daily_limit: int, hourly_limit: int,
+                 store: Optional[JobStore] = None, account: Optional[str] = None):
+        self.platform = platform
+        self.account = account
+        self.daily_limit = daily_limit
+        self.hourly_limit = hourly_limit
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._day = date.today()
+        self._day_count = 0
+        self._hour_window = deque()
+        self._seed(store or get_job_store())
+
+    def _seed(self, store: JobStore):
+        now = datetime.now()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        self._day_count = store.count_applied(self.platform, today, self.account)
+        for applied_at in store.applied_times(self.platform, now - timedelta(hours=1), self.account):
+            try:
+                self._hour_window.append(datetime.fromisoformat(applied_at).timestamp())
+            except ValueError:
+                continue
+
+    def _roll(self, now: float):
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._day_count = 0
+        cutoff = now - 3600
+        while self._hour_window and self._hour_window[0] <= cutoff:
+            self._hour_window.popleft()
+
+    def daily_exhausted(self) -> bool:
+        """当天的投递配额是否已用完"""
+        self._roll(time.time())
+        return self._day_count >= self.daily_limit
+
+    def hourly_wait(self) -> float:
+        """距离每小时配额空出一个名额还需等待的秒数，0 表示可以立即投递"""
+        now = time.time()
+        self._roll(now)
+        if len(self._hour_window) < self.hourly_limit:
+            return 0
+        # 窗口内第 (len - limit + 1) 早的投递过期后才有空位
+        return self._hour_window[len(self._hour_window) - self.hourly_limit] + 3600 - now
+
+    def record(self):
+        """记录一次成功投递"""
+        now = time.time()
+        self._roll(now)
+        self._day_count += 1
+        self._hour_window.append(now)
+
+    def stats(self) -> Dict:
+        self._roll(time.time())
+        return {
+            "today": self._day_count,
+            "daily_limit": self.daily_limit,
+            "last_hour": len(self._hour_window),
+            "hourly_limit": self.hourly_limit
+        }
+
+_quotas: Dict[str, DeliveryQuota] = {}
+
+def get_delivery_quota(platform: str, config: Optional[Dict] = None) -> DeliveryQuota:
+    """获取进程级共享的平台投递配额
+    限制取自 platforms.<name>.delivery_limit，每日限制缺省为 global.max_jobs_per_day；
+    多账号运行时（config 中有 account）只统计该账号的投递
+    """
+    quota = _quotas.get(platform)
+    if quota is None:
+        config = config or {}
+        # 先合并上次崩溃残留的投递日志，否则配额会从0开始计数
+        get_delivery_journal(config)
+        limits = config.get('platforms', {}).get(platform, {}).get('delivery_limit', {})
+        quota = DeliveryQuota(
+            platform,
+            limits.get('daily', config.get('global', {}).get('max_jobs_per_day', 100)),
+            limits.get('hourly', 20),
+            get_job_store(config),
+            config.get('account', {}).get('name')
+        )
+        _quotas[platform] = quota
+    return quota
@@ -0,0 +1,140 @@
+import time
+import random
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+class TokenBucket:
+    """令牌桶
+
+    令牌按 rate（个/秒）持续补充，最多积累 capacity 个。acquire 预占令牌，
+    令牌不足时记为负数并等待补齐，因此并发任务自然排队、共享同一预算，
+    且不依赖绑定事件循环的锁。等待时间带随机抖动。
+    被限流时速率按 backoff_factor 下调并暂停 cooldown 秒，之后每次成功
+    请求按 recover_step 逐步恢复到基准速率（乘性减、加性增）。
+    """
+
+    def __init__(self, rate: float, capacity: float = 1, jitter: float = 0.2,
+                 backoff_factor: float = 0.5, recover_step: float = 0.1,
+                 cooldown: float = 60, min_rate: Optional[float] = None):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.jitter = jitter
+        self.backoff_factor = backoff_factor
+        self.recover_step = recover_step
+        self.cooldown = cooldown
+        self.min_rate = min_rate or rate / 10
+        self.tokens = self.capacity
+        self.throttled_count = 0
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1):
+        """获取令牌，必要时等待"""
+        self._refill()
+        self.tokens -= tokens
+        if self.tokens >= 0:
+            return
+        wait = -self.tokens / self.rate
+        await asyncio.sleep(wait * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def throttled(self):
+        """服务端提示请求过于频繁：降速并暂停一段时间"""
+        self._refill()
+        self.throttled_count += 1
+        self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+        self.tokens = min(self.tokens, 0) - self.cooldown * self.rate
+
+    def success(self):
+        """请求正常：逐步恢复速率"""
+        if self.rate < self.base_rate:
+            self._refill()
+            self.rate = min(self.base_rate, self.rate + self.base_rate * self.recover_step)
+
+class RateLimiter:
+    """按 (platform, action) 划分的令牌桶集合
+
+    action 为 search / detail / deliver / login_check 等请求类型，速率取自
+    rate_limit.actions，可由 platforms.<name>.rate_limit 按平台覆盖。
+    进程内所有任务共享同一组令牌桶。
+    """
+
+    DEFAULT_ACTIONS = {
+        "search": {"per_minute": 20, "burst": 2},
+        "detail": {"per_minute": 30, "burst": 3},
+        "deliver": {"per_minute": 9, "burst": 1},
+        "login_check": {"per_minute": 6, "burst": 2}
+    }
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.logger = logging.getLogger(self.__class__.__name__)
+        limit_config = config.get('rate_limit', {})
+        self.jitter = limit_config.get('jitter', 0.2)
+        self.backoff_factor = limit_config.get('backoff_factor', 0.5)
+        self.recover_step = limit_config.get('recover_step', 0.1)
+        self.cooldown = limit_config.get('throttle_cooldown', 60)
+        self.throttle_keywords = limit_config.get('throttle_keywords', ['频繁', '稍后再试'])
+        self.actions = {**self.DEFAULT_ACTIONS, **limit_config.get('actions', {})}
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    def bucket(self, platform: str, action: str) -> TokenBucket:
+        key = (platform, action)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            platform_config = self.config.get('platforms', {}).get(platform, {})
+            action_config = {
+                **self.actions.get(action, self.actions['search']),
+                **platform_config.get('rate_limit', {}).get(action, {})
+            }
+            bucket = TokenBucket(
+                action_config['per_minute'] / 60.0,
+                capacity=action_config.get('burst', 1),
+                jitter=self.jitter,
+                backoff_factor=self.backoff_factor,
+                recover_step=self.recover_step,
+                cooldown=self.cooldown
+            )
+            self._buckets[key] = bucket
+        return bucket
+
+    async def acquire(self, platform: str, action: str):
+        await self.bucket(platform, action).acquire()
+
+    def is_throttle_message(self, message: str) -> bool:
+        return any(keyword in message for keyword in self.throttle_keywords)
+
+    def report(self, platform: str, action: str, throttled: bool):
+        """根据响应结果调整对应令牌桶的速率"""
+        bucket = self.bucket(platform, action)
+        if throttled:
+            bucket.throttled()
+            self.logger.warning(
+                f"{platform} {action} 请求被限流，降速至每分钟 {bucket.rate * 60:.1f} 次"
+            )
+        else:
+            bucket.success()
+
+    def stats(self) -> Dict:
+        """各令牌桶当前速率（次/分钟）和被限流次数"""
+        return {
+            f"{platform}.{action}": {
+                "per_minute": round(bucket.rate * 60, 2),
+                "throttled": bucket.throttled_count
+            }
+            for (platform, action), bucket in self._buckets.items()
+        }
+
+_limiter: Optional[RateLimiter] = None
+
+def get_rate_limiter(config: Optional[Dict] = None) -> RateLimiter:
+    """获取进程级共享的限速器"""
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(config or {})
+    return _limiter
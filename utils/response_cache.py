@@ -0,0 +1,212 @@
+import sqlite3
+import json
+import os
+import time
+import asyncio
+import zlib
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+class ResponseCache:
+    """磁盘响应缓存
+
+    以键的哈希为主键，把 JSON 响应 zlib 压缩后存入 SQLite。条目超过 TTL
+    视为失效；总大小超过上限时按最近访问时间淘汰（LRU）。
+    get_or_fetch 会合并同一键的并发请求，只发起一次实际获取；获取任务记录
+    发起者（owner），cancel_inflight(owner) 只取消不再被其他发起者等待的任务。
+    """
+
+    def __init__(self, db_path: str = 'data/cache/responses.db', ttl: int = 1800,
+                 max_bytes: int = 50 * 1024 * 1024):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.hits = 0
+        self.misses = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._owners: Dict[str, Set[int]] = {}  # 键 -> 等待该获取任务的发起者 id
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at);
+        ''')
+        self.conn.commit()
+        self._total_bytes = self.conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM entries'
+        ).fetchone()[0]
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """由任意可JSON序列化的部分生成缓存键（字典按键排序，保证参数顺序无关）"""
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """读取未过期的缓存，未命中返回None"""
+        if not self.enabled:
+            return None
+        try:
+            row = self.conn.execute(
+                'SELECT value, created_at FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            now = time.time()
+            if row is None or row[1] + self.ttl < now:
+                self.misses += 1
+                return None
+            with self.conn:
+                self.conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+            return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+        except Exception as e:
+            self.logger.error(f"读取缓存失败: {str(e)}")
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        """写入缓存，必要时淘汰最久未访问的条目"""
+        if not self.enabled:
+            return
+        try:
+            blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+            now = time.time()
+            with self.conn:
+                old = self.conn.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (key, blob, len(blob), now, now)
+                )
+            self._total_bytes += len(blob) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        except Exception as e:
+            self.logger.error(f"写入缓存失败: {str(e)}")
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]], owner: Any = None) -> Any:
+        """读取缓存，未命中时调用 fetch 获取并写入缓存（fetch 返回None不缓存）
+        owner 为发起者（如平台实例），用于停止时只取消该发起者的获取任务
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_set(key, fetch))
+            self._inflight[key] = task
+            self._owners[key] = set()
+            task.add_done_callback(lambda _: self._forget(key))
+        self._owners[key].add(id(owner))
+        # 某个等待者被取消时不影响共享的获取任务
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str):
+        self._inflight.pop(key, None)
+        self._owners.pop(key, None)
+
+    async def cancel_inflight(self, owner: Any = None):
+        """取消 owner 发起的、且没有其他发起者在等待的获取任务，并等待其结束
+        （流水线停止后调用，避免任务在连接池关闭后继续请求）
+        """
+        tasks = []
+        for key, task in list(self._inflight.items()):
+            owners = self._owners.get(key, set())
+            if id(owner) not in owners:
+                continue
+            owners.discard(id(owner))
+            if not owners:
+                task.cancel()
+                tasks.append(task)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch_and_set(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = await fetch()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def _evict(self):
+        """删除过期条目，再按LRU淘汰到容量上限的90%"""
+        target = int(self.max_bytes * 0.9)
+        with self.conn:
+            self.conn.execute('DELETE FROM entries WHERE created_at < ?', (time.time() - self.ttl,))
+            self._total_bytes = self.conn.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM entries'
+            ).fetchone()[0]
+            if self._total_bytes <= target:
+                return
+            victims = []
+            for key, size in self.conn.execute('SELECT key, size FROM entries ORDER BY accessed_at'):
+                victims.append((key,))
+                self._total_bytes -= size
+                if self._total_bytes <= target:
+                    break
+            self.conn.executemany('DELETE FROM entries WHERE key = ?', victims)
+
+    def stats(self) -> Dict:
+        """命中统计，用于调整TTL"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size_bytes": self._total_bytes
+        }
+
+    def close(self):
+        self.conn.close()
+
+_caches: Dict[str, ResponseCache] = {}
+
+def get_response_cache(config: Optional[Dict] = None, name: Optional[str] = None) -> ResponseCache:
+    """获取进程级共享的缓存
+    不指定 name 时为搜索响应缓存，配置在 cache 下；指定 name 时为独立的
+    缓存库（如 recruiters），配置在 cache.<name> 下，缺省值由 defaults 给出
+    """
+    key = name or 'responses'
+    cache = _caches.get(key)
+    if cache is None:
+        cache_config = (config or {}).get('cache', {})
+        section = cache_config.get(name, {}) if name else cache_config
+        defaults = _CACHE_DEFAULTS.get(key, _CACHE_DEFAULTS['responses'])
+        enabled = cache_config.get('enabled', True) and section.get('enabled', True)
+        cache = ResponseCache(
+            section.get('path', f"data/cache/{key}.db"),
+            ttl=section.get('ttl', defaults['ttl']) if enabled else 0,
+            max_bytes=section.get('max_mb', defaults['max_mb']) * 1024 * 1024
+        )
+        _caches[key] = cache
+    return cache
+
+async def cancel_inflight_fetches(*owners):
+    """取消各缓存中由 owners 发起的获取任务（其他平台实例发起的不受影响）"""
+    for cache in list(_caches.values()):
+        for owner in owners:
+            if owner is not None:
+                await cache.cancel_inflight(owner)
+
+_CACHE_DEFAULTS = {
+    "responses": {"ttl": 1800, "max_mb": 50},
+    "recruiters": {"ttl": 86400, "max_mb": 10},
+    "details": {"ttl": 86400, "max_mb": 100},
+    "ai": {"ttl": 604800, "max_mb": 50}
+}
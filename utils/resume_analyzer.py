@@ -1,9 +1,16 @@
+import json
+import os
+import logging
 from typing import Dict, List
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from utils.ai_service import AIService
+from utils.http_client import get_http_client
 
 class ResumeAnalyzer:
     def __init__(self, config):
         self.config = config
         self.ai_service = AIService(config)
+        self.http = get_http_client(config)
         self.logger = logging.getLogger(self.__class__.__name__)
         
     async def analyze_online_resume(self, resume_url: str) -> Dict:
@@ -71,19 +78,22 @@ class ResumeAnalyzer:
                 'Referer': 'https://www.zhipin.com/web/geek/resume'
             }
             
-            # 4. 发送请求获取简历数据
-            async with aiohttp.ClientSession(cookies=cookies) as session:
-                # 先访问简历页面获取必要的token等信息
-                await session.get('https://www.zhipin.com/web/geek/resume', headers=headers)
-                
-                # 然后请求简历数据
-                async with session.get(api_url, headers=headers) as response:
-                    data = await response.json()
-                    if data['code'] != 0:
-                        raise ValueError(f"获取简历失败: {data.get('message')}")
-                        
-                    resume_data = data['zpData']['resume']
-                    return self._parse_resume_data(resume_data)
+            # 4. 发送请求获取简历数据（共享连接池，Cookie按请求传入）
+            # 先访问简历页面获取必要的token等信息
+            async with self.http.request(
+                'GET', 'https://www.zhipin.com/web/geek/resume', headers=headers, cookies=cookies
+            ) as response:
+                for key, morsel in response.cookies.items():
+                    cookies[key] = morsel.value
+                    
+            # 然后请求简历数据
+            async with self.http.request('GET', api_url, headers=headers, cookies=cookies) as response:
+                data = await response.json(content_type=None)
+                if data['code'] != 0:
+                    raise ValueError(f"获取简历失败: {data.get('message')}")
+                    
+                resume_data = data['zpData']['resume']
+                return self._parse_resume_data(resume_data)
                     
         except Exception as e:
             self.logger.error(f"获取BOSS直聘简历失败: {str(e)}")
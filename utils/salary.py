@@ -0,0 +1,64 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# 日薪/时薪折算月薪
+WORK_DAYS_PER_MONTH = 21.75
+WORK_HOURS_PER_DAY = 8
+
+_RANGE = re.compile(
+    r'(\d+(?:\.\d+)?)\s*([kK千万wW]?)\s*(?:[-~～至到]\s*(\d+(?:\.\d+)?)\s*([kK千万wW]?))?'
+)
+# "13薪"、"13-15薪"：发薪月数为区间时取较小值
+_MONTHS = re.compile(r'(\d+)(?:\s*[-~～至到]\s*\d+)?\s*薪')
+_PERIOD = re.compile(r'(?:[/每]\s*(天|日|时|小时|月|年))|(年)薪')
+
+_UNIT_TO_K = {'k': 1, 'K': 1, '千': 1, '万': 10, 'w': 10, 'W': 10}
+
+class Salary(NamedTuple):
+    """解析后的薪资：月薪范围（单位k）和每年发薪月数"""
+    min: float
+    max: float
+    months: int = 12
+
+@lru_cache(maxsize=2048)
+def parse_salary(text: str) -> Optional[Salary]:
+    """解析薪资文本，统一为月薪k和发薪月数
+    支持 "15-25K"、"15-25K·13薪"、"10-20K·13-15薪"、"200-300元/天"、"50-80元/时"、
+    "20-30万/年"、"1-1.5万"、"8000-12000元/月"；"面议"、"面议·13薪"等无法解析时返回None
+    """
+    if not text:
+        return None
+    # 先去掉发薪月数，避免 "面议·13薪" 中的 13 被当作薪资
+    months = _MONTHS.search(text)
+    months = int(months.group(1)) if months else 12
+    text = _MONTHS.sub('', text)
+    match = _RANGE.search(text)
+    if not match:
+        return None
+    low, low_unit, high, high_unit = match.groups()
+    low = float(low)
+    high = float(high) if high else low
+    # "15-25K" 这类只在末尾写单位的情况，两端共用单位
+    unit = high_unit or low_unit
+
+    period = _PERIOD.search(text, match.end())
+    period = (period.group(1) or period.group(2)) if period else ''
+
+    if period in ('天', '日', '时', '小时'):
+        factor = WORK_DAYS_PER_MONTH / 1000
+        if period in ('时', '小时'):
+            factor *= WORK_HOURS_PER_DAY
+        return Salary(round(low * factor, 2), round(high * factor, 2), 12)
+
+    if unit:
+        factor = _UNIT_TO_K[unit]
+    elif '元' in text or low >= 1000:
+        factor = 1 / 1000
+    else:
+        factor = 1
+    # 未注明周期时，"20-30万" 这类数值显然是年薪
+    if period == '年' or (not period and unit in ('万', 'w', 'W') and high > 8):
+        factor /= 12
+        months = 12
+    return Salary(round(low * factor, 2), round(high * factor, 2), months)
@@ -7,6 +7,7 @@ from typing import Dict, List
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import os
+from utils.http_client import close_http_client
 
 class JobScheduler:
     def __init__(self, config_path: str = 'config/config.json'):
@@ -25,14 +26,24 @@ class JobScheduler:
         self.logger.info("启动定时任务调度器")
         
         # 设置定时任务
-        schedule.every().day.at("09:00").do(self.run_all_platforms)  # 早上9点
-        schedule.every().day.at("14:00").do(self.run_all_platforms)  # 下午2点
+        schedule.every().day.at("09:00").do(self._run_scheduled)  # 早上9点
+        schedule.every().day.at("14:00").do(self._run_scheduled)  # 下午2点
         
         # 运行调度循环
         while self.running:
             schedule.run_pending()
             time.sleep(60)
             
+    def _run_scheduled(self):
+        """在新的事件循环中执行一次全部平台任务"""
+        async def _run():
+            try:
+                await self.run_all_platforms()
+            finally:
+                await close_http_client()
+                
+        asyncio.run(_run())
+        
     def stop(self):
         """停止调度器"""
         self.running = False
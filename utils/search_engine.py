@@ -0,0 +1,264 @@
+import asyncio
+import random
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, AsyncIterator, Optional
+
+class PageStats:
+    """单页搜索结果统计，由 _parse_jobs 填充，用于判断是否提前停止翻页"""
+    __slots__ = ('total', 'seen', 'newest_update', 'job_ids')
+
+    def __init__(self):
+        self.total = 0
+        self.seen = 0
+        self.newest_update: Optional[datetime] = None
+        self.job_ids: List[str] = []
+
+    def add(self, job_id: str, seen: bool, update_time=None):
+        """记录页面中的一条原始职位"""
+        self.total += 1
+        self.job_ids.append(job_id)
+        if seen:
+            self.seen += 1
+        updated = parse_update_time(update_time)
+        if updated and (self.newest_update is None or updated > self.newest_update):
+            self.newest_update = updated
+
+    @property
+    def seen_ratio(self) -> float:
+        return self.seen / self.total if self.total else 0.0
+
+def parse_update_time(value) -> Optional[datetime]:
+    """解析职位更新时间，支持毫秒/秒时间戳和ISO格式字符串"""
+    if not value:
+        return None
+    try:
+        if isinstance(value, (int, float)) or str(value).isdigit():
+            timestamp = float(value)
+            if timestamp > 1e12:  # 毫秒时间戳
+                timestamp /= 1000
+            return datetime.fromtimestamp(timestamp)
+        return datetime.fromisoformat(str(value))
+    except (ValueError, OverflowError, OSError):
+        return None
+
+class PageProgress:
+    """一页职位在下游的处理进度；全部处理完（投递或丢弃）后归还所属单元的预取名额"""
+    __slots__ = ('lookahead', 'keyword', 'city', 'page', 'job_ids', 'last_job_id', 'remaining')
+
+    def __init__(self, lookahead: asyncio.Semaphore, keyword: str, city: str, page: int, jobs: List):
+        self.lookahead = lookahead
+        self.keyword = keyword
+        self.city = city
+        self.page = page
+        self.job_ids = [job.job_id for job in jobs]
+        self.last_job_id = jobs[-1].job_id
+        self.remaining = len(jobs)
+
+class PageStopRule:
+    """翻页提前停止规则
+
+    当一页中已见过（含已投递）的职位占比超过阈值，或整页最新的更新时间
+    早于新鲜度截止时间时，停止该 (platform, keyword, city) 的后续翻页。
+    """
+
+    def __init__(self, config: Dict):
+        search_config = config.get('search', {})
+        self.stop_seen_ratio = search_config.get('stop_seen_ratio', 0.8)
+        self.max_job_age_days = search_config.get('max_job_age_days', 7)
+
+    def check(self, stats: PageStats) -> Optional[str]:
+        """返回停止原因，无需停止时返回None"""
+        if stats.total and stats.seen_ratio >= self.stop_seen_ratio:
+            return f"已见过的职位占比 {stats.seen_ratio:.0%}"
+        if stats.newest_update and self.max_job_age_days:
+            cutoff = datetime.now() - timedelta(days=self.max_job_age_days)
+            if stats.newest_update < cutoff:
+                return f"职位更新时间早于 {cutoff:%Y-%m-%d}"
+        return None
+
+class SearchEngine:
+    """关键词×城市并发搜索引擎
+
+    每个 (keyword, city) 组合作为独立任务运行，受同一主机并发上限约束，
+    请求节奏由平台 search 令牌桶统一控制，解析后的职位按页推入共享队列，
+    由下游流水线消费。每个搜索单元最多预取 prefetch_pages 页尚未处理完的
+    数据，使翻页请求与投递等待重叠：下游每处理完（投递或丢弃）一个职位
+    调用 job_done，一页全部处理完后才归还名额，预取不随流水线缓冲区增长。
+
+    一页职位全部处理完、且之前的页也都处理完后，在 JobStore 中记录该单元
+    的翻页进度；上次运行中断且未超过 resume_window_hours 时，从中断处的
+    下一页继续搜索。停止翻页的那一页处理完后才标记该单元已完成。
+    """
+
+    def __init__(self, platform, config: Dict):
+        self.platform = platform
+        self.config = config
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        search_config = config.get('search', {})
+        self.max_concurrency = search_config.get('max_concurrency_per_host', 2)
+        self.prefetch_pages = max(1, search_config.get('prefetch_pages', 2))
+        self.max_retries = config['global']['max_retries']
+        self.resume_window = timedelta(hours=search_config.get('resume_window_hours', 6))
+        self.stop_rule = PageStopRule(config)
+
+        self.queue = asyncio.Queue(maxsize=search_config.get('queue_size', 100))
+        self._host_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._producer: Optional[asyncio.Task] = None
+        # 已产出、尚未处理完的职位所属的页，以 id(job) 为键
+        self._pages: Dict[int, PageProgress] = {}
+        # 各单元连续处理完的最后一页、已处理完但之前还有页未完成的页 {page: last_job_id}，
+        # 以及停止翻页的页
+        self._frontier: Dict[tuple, int] = {}
+        self._completed: Dict[tuple, Dict[int, Optional[str]]] = {}
+        self._final_page: Dict[tuple, int] = {}
+        # 本轮各单元已记录的进度 (page, finished)，进度只前进
+        self._progress: Dict[tuple, tuple] = {}
+
+    async def iter_jobs(self) -> AsyncIterator[Dict]:
+        """启动所有搜索任务，并按到达顺序产出职位"""
+        self._producer = asyncio.create_task(self._produce())
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                break
+            progress, jobs = item
+            for job in jobs:
+                self._pages[id(job)] = progress
+            for job in jobs:
+                yield job
+
+    def job_done(self, job):
+        """下游处理完一个职位；所属页全部处理完后把其中的职位记为已见过，允许该单元
+        再预取一页，并推进翻页进度
+        """
+        progress = self._pages.pop(id(job), None)
+        if progress is None:
+            return
+        progress.remaining -= 1
+        if progress.remaining == 0:
+            self.platform.store.mark_seen(self.platform.platform_name, progress.job_ids)
+            progress.lookahead.release()
+            self._page_done(progress.keyword, progress.city, progress.page, progress.last_job_id)
+
+    def _page_done(self, keyword: str, city: str, page: int, last_job_id: Optional[str] = None):
+        """记录处理完的页；预取的页可能先于前面的页完成，只按连续处理完的页保存进度"""
+        cell = (keyword, city)
+        completed = self._completed[cell]
+        completed[page] = last_job_id
+        frontier = self._frontier[cell]
+        if frontier + 1 not in completed:
+            return
+        while frontier + 1 in completed:
+            frontier += 1
+            last_job_id = completed.pop(frontier)
+        self._frontier[cell] = frontier
+        finished = cell in self._final_page and frontier >= self._final_page[cell]
+        self._save_checkpoint(keyword, city, frontier, last_job_id, finished)
+
+    async def stop(self):
+        """停止所有未完成的搜索任务"""
+        if self._producer and not self._producer.done():
+            self._producer.cancel()
+            try:
+                await self._producer
+            except asyncio.CancelledError:
+                pass
+
+    async def _produce(self):
+        """并发运行所有搜索单元，结束后写入结束标记
+        search.cells 指定 [keyword, city] 列表时只搜索这些单元（多账号分片）
+        """
+        cells = self.config.get('search', {}).get('cells') or [
+            (keyword, city)
+            for keyword in self.config['job_preferences']['keywords']
+            for city in self.config['job_preferences']['cities']
+        ]
+        cells = [self._run_cell(keyword, city) for keyword, city in cells]
+        try:
+            await asyncio.gather(*cells)
+        finally:
+            await self.queue.put(None)
+
+    async def _run_cell(self, keyword: str, city: str):
+        """搜索单个 (keyword, city) 组合的所有分页"""
+        page = self._resume_page(keyword, city)
+        self._frontier[(keyword, city)] = page - 1
+        self._completed[(keyword, city)] = {}
+        retry_count = 0
+        lookahead = asyncio.Semaphore(self.prefetch_pages)
+
+        while True:
+            await lookahead.acquire()
+            try:
+                async with self._host_semaphore:
+                    self.logger.info(f"搜索 {city} 的 {keyword} 职位，第 {page} 页")
+                    stats = PageStats()
+                    jobs = await self.platform._fetch_jobs(keyword, city, page, stats)
+            except Exception as e:
+                lookahead.release()
+                retry_count += 1
+                if retry_count >= self.max_retries:
+                    self.logger.error(f"搜索失败次数过多，跳过当前搜索: {str(e)}")
+                    return
+                self.logger.warning(f"搜索失败，第 {retry_count} 次重试: {str(e)}")
+                await asyncio.sleep(random.uniform(10, 15))
+                continue
+
+            if not stats.total:
+                lookahead.release()
+                self._final_page[(keyword, city)] = page
+                self._page_done(keyword, city, page)
+                self.logger.info(f"{city} 的 {keyword} 职位搜索完成")
+                return
+
+            reason = self.stop_rule.check(stats)
+            if reason:
+                # 这一页处理完后该单元即完成
+                self._final_page[(keyword, city)] = page
+
+            # 解析时已被过滤的职位直接记为见过，其余职位在整页处理完后再记录，
+            # 避免预取但未处理的页被提前停止规则当作已见过
+            job_ids = {job.job_id for job in jobs}
+            self.platform.store.mark_seen(
+                self.platform.platform_name,
+                [job_id for job_id in stats.job_ids if job_id not in job_ids]
+            )
+            if jobs:
+                await self.queue.put((PageProgress(lookahead, keyword, city, page, jobs), jobs))
+            else:
+                lookahead.release()
+                self._page_done(keyword, city, page, stats.job_ids[-1])
+
+            if reason:
+                self.logger.info(f"{city} 的 {keyword} 职位提前停止翻页: {reason}")
+                return
+
+            page += 1
+            retry_count = 0
+
+    def _resume_page(self, keyword: str, city: str) -> int:
+        """上次未完成且仍在恢复窗口内的搜索单元从断点的下一页开始"""
+        checkpoint = self.platform.store.get_checkpoint(self.platform.platform_name, keyword, city)
+        if (checkpoint is None or checkpoint['finished'] or
+                datetime.now() - checkpoint['updated_at'] > self.resume_window):
+            return 1
+        self.logger.info(
+            f"{city} 的 {keyword} 从第 {checkpoint['page'] + 1} 页继续搜索"
+            f"（上次处理到职位 {checkpoint['last_job_id']}）"
+        )
+        return checkpoint['page'] + 1
+
+    def _save_checkpoint(self, keyword: str, city: str, page: int,
+                         last_job_id: Optional[str] = None, finished: bool = False):
+        last_page, last_finished = self._progress.get((keyword, city), (0, False))
+        if last_finished or (page <= last_page and not finished):
+            return
+        self._progress[(keyword, city)] = (page, finished)
+        try:
+            self.platform.store.save_checkpoint(
+                self.platform.platform_name, keyword, city, page, last_job_id, finished
+            )
+        except Exception as e:
+            self.logger.error(f"保存搜索进度失败: {str(e)}")
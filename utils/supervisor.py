@@ -0,0 +1,110 @@
+import os
+import copy
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+PLATFORM_CLASSES = {
+    'boss': ('platforms.boss', 'BossBot'),
+    'liepin': ('platforms.liepin', 'LiepinBot'),
+    'zhilian': ('platforms.zhilian', 'ZhilianBot')
+}
+
+class AccountSupervisor:
+    """多账号调度
+
+    每个账号（cookie 文件、代理、投递配额）在独立的进程中运行，搜索单元
+    （关键词 × 城市）按轮询分给各账号。各进程共享同一个 SQLite 库：已投递
+    记录用于去重，job_claims 保证同一职位只被一个账号处理。
+    """
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.accounts: List[Dict] = config.get('supervisor', {}).get('accounts', [])
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def shard_cells(self) -> List[List[List[str]]]:
+        """把搜索单元轮询分配给各账号"""
+        preferences = self.config['job_preferences']
+        cells = [
+            [keyword, city]
+            for keyword in preferences['keywords']
+            for city in preferences['cities']
+        ]
+        shards = [[] for _ in self.accounts]
+        for i, cell in enumerate(cells):
+            shards[i % len(shards)].append(cell)
+        return shards
+
+    def account_config(self, account: Dict, cells: List[List[str]]) -> Dict:
+        """生成单个账号进程使用的配置"""
+        config = copy.deepcopy(self.config)
+        name = account['name']
+        platform = account.get('platform', 'boss')
+        platform_config = config['platforms'].setdefault(platform, {})
+        platform_config['cookies_file'] = account.get(
+            'cookies_file', f"cookies/{platform}_{name}_cookies.txt"
+        )
+        for key in ('proxy', 'delivery_limit', 'max_jobs'):
+            if key in account:
+                platform_config[key] = account[key]
+        # 每个账号单独的日志、向量目录和预评分语料，避免多个进程写同一个文件
+        journal_config = config.setdefault('journal', {})
+        journal_config['dir'] = os.path.join(journal_config.get('dir', 'data/journal'), name)
+        embedding_config = config.setdefault('ai', {}).setdefault('embedding', {})
+        embedding_config['path'] = os.path.join(embedding_config.get('path', 'data/vectors'), name)
+        prescore_config = config.setdefault('prescore', {})
+        corpus_root, corpus_ext = os.path.splitext(prescore_config.get('corpus_path', 'data/prescore_corpus.npz'))
+        prescore_config['corpus_path'] = f"{corpus_root}_{name}{corpus_ext}"
+        config.setdefault('search', {})['cells'] = cells
+        config['account'] = {'name': name, 'platform': platform}
+        return config
+
+    def run(self) -> Dict[str, Dict]:
+        """并行运行所有账号，返回各账号的统计信息"""
+        if not self.accounts:
+            self.logger.error("未配置 supervisor.accounts")
+            return {}
+        configs = [
+            self.account_config(account, cells)
+            for account, cells in zip(self.accounts, self.shard_cells())
+            if cells
+        ]
+        if not configs:
+            self.logger.error("没有可分配的搜索单元（job_preferences.keywords / cities 为空）")
+            return {}
+        results = {}
+        with ProcessPoolExecutor(max_workers=len(configs)) as executor:
+            futures = {
+                config['account']['name']: executor.submit(run_account, config)
+                for config in configs
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    self.logger.error(f"账号 {name} 运行失败: {str(e)}")
+                    results[name] = {"error": str(e)}
+        return results
+
+def run_account(config: Dict) -> Dict:
+    """账号进程入口：登录、搜索投递并返回统计信息"""
+    return asyncio.run(_run_account(config))
+
+async def _run_account(config: Dict) -> Dict:
+    import importlib
+    from utils.http_client import close_http_client
+
+    account = config['account']
+    logger = logging.getLogger('AccountSupervisor')
+    module_name, class_name = PLATFORM_CLASSES[account['platform']]
+    bot = getattr(importlib.import_module(module_name), class_name)(config)
+    try:
+        if not await bot.login():
+            logger.error(f"账号 {account['name']} 登录失败")
+            return {"error": "登录失败"}
+        await bot.search_jobs()
+        return bot.analyzer.get_statistics()
+    finally:
+        await close_http_client()
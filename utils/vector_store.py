@@ -0,0 +1,123 @@
+import os
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+class VectorStore:
+    """职位向量库
+
+    向量归一化后按行存入内存映射的 float32 矩阵（vectors.f32），行号与
+    keys.txt 中的内容哈希一一对应；容量不足时文件按倍数扩展。先写向量再
+    追加键，进程中断后以 keys.txt 的行数为准。余弦相似度即一次矩阵乘法。
+    """
+
+    def __init__(self, directory: str = 'data/vectors', initial_capacity: int = 1024):
+        self.directory = directory
+        self.initial_capacity = initial_capacity
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.vectors_path = os.path.join(directory, 'vectors.f32')
+        self.keys_path = os.path.join(directory, 'keys.txt')
+        self.dim_path = os.path.join(directory, 'dim')
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.memmap] = None
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.dim_path):
+            return
+        with open(self.dim_path, 'r') as f:
+            self.dim = int(f.read().strip())
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    key = line.strip()
+                    if key:
+                        self._rows[key] = len(self._rows)
+        self._open(max(self.initial_capacity, len(self._rows)))
+
+    def _open(self, capacity: int):
+        """按容量打开（必要时扩展）向量文件"""
+        size = capacity * self.dim * 4
+        mode = 'r+b' if os.path.exists(self.vectors_path) else 'w+b'
+        with open(self.vectors_path, mode) as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < size:
+                f.truncate(size)
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r+',
+                                 shape=(capacity, self.dim))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def rows(self, keys: Sequence[str]) -> Tuple[List[int], List[str]]:
+        """返回已存在键的行号和缺失的键"""
+        rows, missing = [], []
+        for key in keys:
+            row = self._rows.get(key)
+            if row is None:
+                missing.append(key)
+            else:
+                rows.append(row)
+        return rows, missing
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray):
+        """写入向量（已存在的键跳过）"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            with open(self.dim_path, 'w') as f:
+                f.write(str(self.dim))
+            self._open(self.initial_capacity)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"向量维度不一致: {vectors.shape[1]} != {self.dim}")
+
+        new = [(key, vector) for key, vector in zip(keys, vectors) if key not in self._rows]
+        if not new:
+            return
+        start = len(self._rows)
+        capacity = self._matrix.shape[0]
+        if start + len(new) > capacity:
+            while start + len(new) > capacity:
+                capacity *= 2
+            self._open(capacity)
+        block = np.stack([vector for _, vector in new])
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        self._matrix[start:start + len(new)] = block / np.where(norms > 0, norms, 1)
+        self._matrix.flush()
+        with open(self.keys_path, 'a', encoding='utf-8') as f:
+            for i, (key, _) in enumerate(new):
+                f.write(key + '\n')
+                self._rows[key] = start + i
+
+    def get(self, keys: Sequence[str]) -> np.ndarray:
+        """读取已归一化的向量，键必须存在"""
+        return np.asarray(self._matrix[[self._rows[key] for key in keys]])
+
+    def similarity(self, keys: Sequence[str], queries: np.ndarray) -> np.ndarray:
+        """keys 对应向量与每个查询向量的余弦相似度，形状为 (len(keys), len(queries))"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms > 0, norms, 1)
+        return self.get(keys) @ queries.T
+
+    def close(self):
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+
+_store: Optional[VectorStore] = None
+
+def get_vector_store(config: Optional[Dict] = None) -> VectorStore:
+    """获取进程级共享的向量库，目录取自 ai.embedding.path"""
+    global _store
+    if _store is None:
+        embedding_config = (config or {}).get('ai', {}).get('embedding', {})
+        _store = VectorStore(embedding_config.get('path', 'data/vectors'))
+    return _store